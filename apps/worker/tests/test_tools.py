@@ -1,13 +1,17 @@
 """Tests for worker conversion utilities."""
 
-import os
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from tempfile import TemporaryDirectory
 from io import BytesIO
+from http.server import BaseHTTPRequestHandler, HTTPServer
 
 import shutil
 import subprocess
-from unittest.mock import patch
+import threading
+import time
+import zipfile
+from typing import Callable, Iterable, Iterator, List, NamedTuple
 
 import pytest
 import requests
@@ -20,6 +24,11 @@ from pypdf import PdfReader, PdfWriter
 
 from zenpdf_worker.tools import (
     MAX_WEB_BYTES,
+    _ghostscript_version,
+    _resolve_unicode_font_path,
+    _soffice_profile_dir,
+    _tool_path,
+    _web_session,
     compare_pdfs,
     compress_pdf,
     crop_pdf,
@@ -45,6 +54,8 @@ from zenpdf_worker.tools import (
     protect_pdf,
     repair_pdf,
     redact_pdf,
+    remove_pages,
+    reorder_pages,
     rotate_pdf,
     scan_to_pdf,
     sign_pdf,
@@ -57,6 +68,25 @@ from zenpdf_worker.tools import (
 )
 
 
+@pytest.fixture(autouse=True)
+def tool_paths() -> Iterator[None]:
+    """Forget resolved tool paths so each test sees its own patched shutil.which."""
+    _tool_path.cache_clear()
+    yield
+    _tool_path.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _blank_pdf_bytes(pages: int) -> bytes:
+    """Build a blank 300x300pt PDF once per distinct page count."""
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=300, height=300)
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
 def _make_pdf(path: Path, pages: int) -> None:
     """
     Create a blank PDF at the given path containing the specified number of pages.
@@ -65,633 +95,1148 @@ def _make_pdf(path: Path, pages: int) -> None:
         path (Path): Destination file path for the generated PDF.
         pages (int): Number of blank pages to include (must be greater than or equal to 0).
     """
-    writer = PdfWriter()
-    for _ in range(pages):
-        writer.add_blank_page(width=300, height=300)
-    with path.open("wb") as handle:
-        writer.write(handle)
+    path.write_bytes(_blank_pdf_bytes(pages))
 
 
-def _make_text_pdf(path: Path, text: str) -> None:
-    """Create a single-page PDF with text content."""
+@lru_cache(maxsize=None)
+def _text_pdf_bytes(text: str) -> bytes:
+    """Render a single-page PDF with text content once per distinct text."""
     pdf = FPDF(orientation="P", unit="mm", format="A4")
     pdf.add_page()
     pdf.set_font("Helvetica", size=14)
     pdf.text(10, 20, text)
-    pdf.output(str(path))
+    return bytes(pdf.output())
+
+
+def _make_text_pdf(path: Path, text: str) -> None:
+    """Create a single-page PDF with text content."""
+    path.write_bytes(_text_pdf_bytes(text))
+
+
+@lru_cache(maxsize=1)
+def _image_pdf_bytes() -> bytes:
+    """Build the single-page raster PDF once per test session."""
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 300, 300), False)
+    pixmap.set_rect(pixmap.irect, (120, 140, 180))
+    with fitz.open() as document:
+        page = document.new_page(width=300, height=300)
+        page.insert_image(fitz.Rect(0, 0, 300, 300), pixmap=pixmap)
+        return document.tobytes()
+
+
+@lru_cache(maxsize=1)
+def _sample_png_bytes() -> bytes:
+    """Encode the 200x200 sample PNG used by the image tests once."""
+    buffer = BytesIO()
+    Image.new("RGB", (200, 200), color=(120, 140, 180)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=1)
+def _sample_docx_bytes() -> bytes:
+    """Build the one-paragraph sample DOCX used by the Office tests once."""
+    buffer = BytesIO()
+    document = Document()
+    document.add_paragraph("Hello")
+    document.save(buffer)
+    return buffer.getvalue()
 
 
 def _make_image_pdf(path: Path) -> None:
     """Create a single-page PDF containing a raster image."""
-    image = Image.new("RGB", (300, 300), color=(120, 140, 180))
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        image_path = temp_path / "image.png"
-        image.save(image_path)
-        document = fitz.open()
-        page = document.new_page(width=300, height=300)
-        page.insert_image(fitz.Rect(0, 0, 300, 300), filename=str(image_path))
-        document.save(str(path))
-        document.close()
+    path.write_bytes(_image_pdf_bytes())
 
 
-def _make_pdf_with_metadata(path: Path, title: str) -> None:
-    """Create a PDF with a Title metadata value."""
+class _PdfInfo(NamedTuple):
+    """Page count, encryption flag, and title of a PDF."""
+
+    n_pages: int
+    is_encrypted: bool
+    title: str
+
+
+def _pdf_quickinfo(path: Path) -> _PdfInfo:
+    """Read basic PDF facts via MuPDF, which loads objects lazily."""
+    with fitz.open(str(path)) as document:
+        return _PdfInfo(
+            document.page_count,
+            document.is_encrypted,
+            (document.metadata or {}).get("title", ""),
+        )
+
+
+@lru_cache(maxsize=None)
+def _titled_pdf_bytes(title: str) -> bytes:
+    """Build a blank single-page PDF with a Title once per distinct title."""
     writer = PdfWriter()
     writer.add_blank_page(width=300, height=300)
     writer.add_metadata({"/Title": title})
-    with path.open("wb") as handle:
-        writer.write(handle)
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
 
 
-def test_merge_pdfs() -> None:
+def _make_pdf_with_metadata(path: Path, title: str) -> None:
+    """Create a PDF with a Title metadata value."""
+    path.write_bytes(_titled_pdf_bytes(title))
+
+
+def test_merge_pdfs(tmp_path: Path) -> None:
     """Merge multiple PDFs into one output."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        first = temp_path / "first.pdf"
-        second = temp_path / "second.pdf"
-        _make_pdf(first, 1)
-        _make_pdf(second, 2)
+    first = tmp_path / "first.pdf"
+    second = tmp_path / "second.pdf"
+    _make_pdf(first, 1)
+    _make_pdf(second, 2)
+
+    output = merge_pdfs([first, second], tmp_path / "merged.pdf")
+    assert _pdf_quickinfo(output).n_pages == 3
+
+
+def test_merge_pdfs_parses_repeated_input_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Reuse one parsed reader when the same PDF is merged more than once."""
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 2)
+    monkeypatch.setattr("zenpdf_worker.tools.shutil.which", lambda _: None)
 
-        output = merge_pdfs([first, second], temp_path / "merged.pdf")
-        reader = PdfReader(str(output))
-        assert len(reader.pages) == 3
+    readers = []
 
+    def counting_reader(*args, **kwargs):
+        readers.append(PdfReader(*args, **kwargs))
+        return readers[-1]
 
-def test_split_pdf_ranges() -> None:
+    monkeypatch.setattr("zenpdf_worker.tools.PdfReader", counting_reader)
+    output = merge_pdfs([source, source], tmp_path / "merged.pdf")
+
+    assert len(readers) == 1
+    assert _pdf_quickinfo(output).n_pages == 4
+
+
+def test_split_pdf_ranges(tmp_path: Path) -> None:
     """Split a PDF using page ranges."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 3)
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 3)
+
+    outputs = split_pdf(source, tmp_path, "1-2,3")
+    assert len(outputs) == 2
+    assert _pdf_quickinfo(outputs[0]).n_pages == 2
 
-        outputs = split_pdf(source, temp_path, "1-2,3")
-        assert len(outputs) == 2
-        reader = PdfReader(str(outputs[0]))
-        assert len(reader.pages) == 2
 
+def test_split_pdf_falls_back_per_range(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep range order and rebuild only the ranges qpdf failed to extract."""
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 3)
 
-def test_rotate_pdf() -> None:
+    def fake_run_qpdf(args, **_kwargs):
+        if args[3] == "3-3":
+            return False
+        shutil.copyfile(source, args[-1])
+        return True
+
+    monkeypatch.setattr("zenpdf_worker.tools.shutil.which", lambda _: "/usr/bin/qpdf")
+    monkeypatch.setattr("zenpdf_worker.tools._run_qpdf", fake_run_qpdf)
+    outputs = split_pdf(source, tmp_path, "1-2,3")
+
+    assert [path.name for path in outputs] == ["split_1.pdf", "split_2.pdf"]
+    assert [_pdf_quickinfo(path).n_pages for path in outputs] == [3, 1]
+
+
+def test_rotate_pdf(tmp_path: Path) -> None:
     """Rotate pages in a PDF."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 1)
-        output = rotate_pdf(source, temp_path / "rotated.pdf", 90, None)
-        assert output.exists()
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 1)
+    output = rotate_pdf(source, tmp_path / "rotated.pdf", 90, None)
+    assert output.exists()
+
+
+def test_merge_and_rotate_prefer_qpdf(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Route merge and rotate through qpdf when it is installed."""
+    first = tmp_path / "first.pdf"
+    second = tmp_path / "second.pdf"
+    _make_pdf(first, 1)
+    _make_pdf(second, 3)
+    commands = []
+
+    def fake_run(command, **_kwargs):
+        commands.append(command)
+        Path(command[-1]).write_bytes(b"%PDF-1.7\n")
+        return subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+
+    monkeypatch.setattr("zenpdf_worker.tools.shutil.which", lambda _: "/usr/bin/qpdf")
+    monkeypatch.setattr("zenpdf_worker.tools.subprocess.run", fake_run)
+
+    merge_pdfs([first, second], tmp_path / "merged.pdf")
+    rotate_pdf(second, tmp_path / "rotated.pdf", 180, "1,2")
 
+    assert commands[0][1:4] == ["--warning-exit-0", "--empty", "--pages"]
+    assert commands[0][4:9] == [str(first), "1-z", str(second), "1-z", "--"]
+    assert "--rotate=+180:1-2" in commands[1]
 
-def test_watermark_and_page_numbers() -> None:
+
+def test_watermark_and_page_numbers(tmp_path: Path) -> None:
     """Apply watermark and page numbers to a PDF."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 2)
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 2)
+
+    watermarked = watermark_pdf(source, tmp_path / "watermarked.pdf", "CONFIDENTIAL", None)
+    numbered = page_numbers_pdf(source, tmp_path / "numbered.pdf", 3, None)
+
+    watermarked_reader = PdfReader(str(watermarked))
+    numbered_reader = PdfReader(str(numbered))
+    assert "CONFIDENTIAL" in (watermarked_reader.pages[0].extract_text() or "")
+    assert "3" in (numbered_reader.pages[0].extract_text() or "")
 
-        watermarked = watermark_pdf(source, temp_path / "watermarked.pdf", "CONFIDENTIAL", None)
-        numbered = page_numbers_pdf(source, temp_path / "numbered.pdf", 3, None)
 
-        watermarked_reader = PdfReader(str(watermarked))
-        numbered_reader = PdfReader(str(numbered))
-        assert "CONFIDENTIAL" in (watermarked_reader.pages[0].extract_text() or "")
-        assert "3" in (numbered_reader.pages[0].extract_text() or "")
+def test_watermark_embeds_subset_unicode_font(tmp_path: Path) -> None:
+    """Draw non-Latin-1 watermark text with an embedded, subset Unicode font."""
+    if _resolve_unicode_font_path() is None:
+        pytest.skip("no Unicode TTF available")
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 1)
+
+    watermarked = watermark_pdf(source, tmp_path / "watermarked.pdf", "Καλημέρα", None)
+    with fitz.open(str(watermarked)) as document:
+        page = document.load_page(0)
+        assert "Καλημέρα" in page.get_text("text")
+        fonts = document.get_page_fonts(0)
+    assert fonts
+    assert all("+" in font[3] for font in fonts)
+
+
+@pytest.mark.parametrize(
+    "transform",
+    [
+        lambda source, output: watermark_pdf(source, output, "NOTE", None),
+        lambda source, output: page_numbers_pdf(source, output, 1, None),
+    ],
+    ids=["watermark", "page_numbers"],
+)
+def test_overlays_reject_owner_password_pdf(
+    tmp_path: Path, transform: Callable[[Path, Path], Path]
+) -> None:
+    """Refuse to rewrite owner-password-only PDFs, which would drop their encryption."""
+    source = tmp_path / "owner.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=300, height=300)
+    writer.encrypt("", owner_password="owner")
+    with source.open("wb") as handle:
+        writer.write(handle)
 
+    with pytest.raises(ValueError, match="PDF is encrypted"):
+        transform(source, tmp_path / "output.pdf")
 
-def test_watermark_rejects_invalid_pages() -> None:
+
+def test_watermark_rejects_invalid_pages(tmp_path: Path) -> None:
     """Reject invalid page selections when watermarking."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 2)
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 2)
 
-        with pytest.raises(ValueError):
-            watermark_pdf(source, temp_path / "watermarked.pdf", "NOTE", "nope")
+    with pytest.raises(ValueError):
+        watermark_pdf(source, tmp_path / "watermarked.pdf", "NOTE", "nope")
 
 
-def test_crop_pdf() -> None:
+def test_crop_pdf(tmp_path: Path) -> None:
     """Crop a PDF using point margins."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 1)
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 1)
 
-        cropped = crop_pdf(source, temp_path / "cropped.pdf", "10,10,10,10", None)
-        reader = PdfReader(str(cropped))
-        page = reader.pages[0]
-        assert float(page.cropbox.width) == pytest.approx(280)
-        assert float(page.cropbox.height) == pytest.approx(280)
+    cropped = crop_pdf(source, tmp_path / "cropped.pdf", "10,10,10,10", None)
+    reader = PdfReader(str(cropped))
+    page = reader.pages[0]
+    assert float(page.cropbox.width) == pytest.approx(280)
+    assert float(page.cropbox.height) == pytest.approx(280)
 
 
-def test_crop_pdf_rejects_invalid_margins() -> None:
+@pytest.mark.parametrize("margins", ["bad", "10,10", "-5"])
+def test_crop_pdf_rejects_invalid_margins(tmp_path: Path, margins: str) -> None:
     """Reject invalid margin specifications when cropping."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 1)
-
-        for index, margins in enumerate(["bad", "10,10", "-5"], start=1):
-            with pytest.raises(ValueError):
-                crop_pdf(
-                    source,
-                    temp_path / f"invalid_{index}.pdf",
-                    margins,
-                    None,
-                )
-
-
-def test_image_to_pdf_and_pdf_to_jpg() -> None:
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 1)
+
+    with pytest.raises(ValueError):
+        crop_pdf(source, tmp_path / "invalid.pdf", margins, None)
+
+
+def test_image_to_pdf_and_pdf_to_jpg(tmp_path: Path) -> None:
     """Convert image to PDF and PDF to JPG."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        image_path = temp_path / "sample.png"
-        image = Image.new("RGB", (200, 200), color=(120, 140, 180))
-        image.save(image_path)
+    image_path = tmp_path / "sample.png"
+    image_path.write_bytes(_sample_png_bytes())
 
-        pdf_path = image_to_pdf([image_path], temp_path / "image.pdf")
-        assert pdf_path.exists()
+    pdf_path = image_to_pdf([image_path], tmp_path / "image.pdf")
+    assert pdf_path.exists()
 
-        images = pdf_to_jpg(pdf_path, temp_path, dpi=72)
-        assert len(images) == 1
-        zipped = zip_outputs(images, temp_path / "pages.zip")
-        assert zipped.exists()
+    images = pdf_to_jpg(pdf_path, tmp_path, dpi=72)
+    assert len(images) == 1
+    notes = tmp_path / "notes.txt"
+    notes.write_text("page notes\n" * 50, encoding="utf-8")
+    zipped = zip_outputs([*images, notes], tmp_path / "pages.zip")
+    assert zipped.exists()
+    with zipfile.ZipFile(zipped) as archive:
+        assert archive.getinfo(images[0].name).compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo("notes.txt").compress_type == zipfile.ZIP_DEFLATED
 
 
-def test_unlock_and_protect_pdf() -> None:
+def test_unlock_and_protect_pdf(tmp_path: Path) -> None:
     """Protect a PDF with a password and unlock it."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 1)
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 1)
 
-        protected = protect_pdf(source, temp_path / "protected.pdf", "secret")
-        protected_reader = PdfReader(str(protected))
-        assert protected_reader.is_encrypted
+    protected = protect_pdf(source, tmp_path / "protected.pdf", "secret")
+    assert _pdf_quickinfo(protected).is_encrypted
 
-        unlocked = unlock_pdf(protected, temp_path / "unlocked.pdf", "secret")
-        unlocked_reader = PdfReader(str(unlocked))
-        assert not unlocked_reader.is_encrypted
+    unlocked = unlock_pdf(protected, tmp_path / "unlocked.pdf", "secret")
+    assert not _pdf_quickinfo(unlocked).is_encrypted
 
 
-def test_repair_pdf() -> None:
+def test_repair_pdf(tmp_path: Path) -> None:
     """Rewrite a PDF into a repaired copy."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 2)
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 2)
 
-        repaired = repair_pdf(source, temp_path / "repaired.pdf")
-        reader = PdfReader(str(repaired))
-        assert len(reader.pages) == 2
+    repaired = repair_pdf(source, tmp_path / "repaired.pdf")
+    assert _pdf_quickinfo(repaired).n_pages == 2
 
 
-def test_watermark_preserves_metadata() -> None:
+@pytest.mark.parametrize(
+    "transform",
+    [
+        lambda source, output: watermark_pdf(source, output, "NOTE", None),
+        lambda source, output: page_numbers_pdf(source, output, 1, None),
+        lambda source, output: rotate_pdf(source, output, 90, None),
+    ],
+    ids=["watermark", "page_numbers", "rotate"],
+)
+def test_watermark_preserves_metadata(
+    tmp_path: Path, transform: Callable[[Path, Path], Path]
+) -> None:
     """Keep PDF metadata after watermarking, numbering, and rotating."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf_with_metadata(source, "ZenPDF")
-
-        watermarked = watermark_pdf(source, temp_path / "watermarked.pdf", "NOTE", None)
-        numbered = page_numbers_pdf(source, temp_path / "numbered.pdf", 1, None)
-        rotated = rotate_pdf(source, temp_path / "rotated.pdf", 90, None)
-
-        watermarked_reader = PdfReader(str(watermarked))
-        numbered_reader = PdfReader(str(numbered))
-        rotated_reader = PdfReader(str(rotated))
-        watermarked_metadata = watermarked_reader.metadata or {}
-        numbered_metadata = numbered_reader.metadata or {}
-        rotated_metadata = rotated_reader.metadata or {}
-        assert watermarked_metadata.get("/Title") == "ZenPDF"
-        assert numbered_metadata.get("/Title") == "ZenPDF"
-        assert rotated_metadata.get("/Title") == "ZenPDF"
-
-
-def test_redact_pdf() -> None:
-    """Redact matching text in a PDF."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_text_pdf(source, "CONFIDENTIAL")
+    source = tmp_path / "source.pdf"
+    _make_pdf_with_metadata(source, "ZenPDF")
 
-        redacted = redact_pdf(source, temp_path / "redacted.pdf", "CONFIDENTIAL", None)
-        reader = PdfReader(str(redacted))
-        assert "CONFIDENTIAL" not in (reader.pages[0].extract_text() or "")
+    output = transform(source, tmp_path / "output.pdf")
+    assert _pdf_quickinfo(output).title == "ZenPDF"
 
 
-def test_highlight_pdf() -> None:
-    """Highlight matching text in a PDF."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_text_pdf(source, "CONFIDENTIAL")
+def test_redact_pdf(tmp_path: Path) -> None:
+    """Redact matching text in a PDF."""
+    source = tmp_path / "source.pdf"
+    _make_text_pdf(source, "CONFIDENTIAL")
 
-        highlighted = highlight_pdf(source, temp_path / "highlighted.pdf", "CONFIDENTIAL", None)
-        document = fitz.open(str(highlighted))
-        page = document.load_page(0)
-        annotations = list(page.annots() or [])
-        document.close()
-        assert annotations
+    redacted = redact_pdf(source, tmp_path / "redacted.pdf", "CONFIDENTIAL", None)
+    reader = PdfReader(str(redacted))
+    assert "CONFIDENTIAL" not in (reader.pages[0].extract_text() or "")
 
 
-def test_compare_pdfs() -> None:
+def test_highlight_pdf(tmp_path: Path) -> None:
+    """Highlight matching text in a PDF."""
+    source = tmp_path / "source.pdf"
+    _make_text_pdf(source, "CONFIDENTIAL")
+
+    highlighted = highlight_pdf(source, tmp_path / "highlighted.pdf", "CONFIDENTIAL", None)
+    document = fitz.open(str(highlighted))
+    page = document.load_page(0)
+    annotations = list(page.annots() or [])
+    document.close()
+    assert annotations
+
+
+def test_redact_pdf_parallel_search(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Redact matches found by the process-pool page search."""
+    first = tmp_path / "first.pdf"
+    second = tmp_path / "second.pdf"
+    source = tmp_path / "source.pdf"
+    _make_text_pdf(first, "CONFIDENTIAL")
+    _make_text_pdf(second, "Public CONFIDENTIAL")
+    merge_pdfs([first, second], source)
+    monkeypatch.setattr("zenpdf_worker.tools.SEARCH_PARALLEL_MIN_PAGES", 1)
+    monkeypatch.setenv("ZENPDF_SEARCH_PROCESSES", "2")
+
+    redacted = redact_pdf(source, tmp_path / "redacted.pdf", "CONFIDENTIAL", None)
+    reader = PdfReader(str(redacted))
+    texts = [page.extract_text() or "" for page in reader.pages]
+    assert all("CONFIDENTIAL" not in text for text in texts)
+    assert "Public" in texts[1]
+
+
+def test_pdf_to_jpg_parallel_render(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Render pages in order through the process pool."""
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 3)
+    monkeypatch.setattr("zenpdf_worker.tools.RENDER_PARALLEL_MIN_PAGES", 1)
+    monkeypatch.setenv("ZENPDF_RENDER_PROCESSES", "2")
+
+    images = pdf_to_jpg(source, tmp_path, dpi=36)
+    assert [image.name for image in images] == ["source_1.jpg", "source_2.jpg", "source_3.jpg"]
+    assert all(image.stat().st_size for image in images)
+
+
+def test_reorder_pages_uses_qpdf_page_selection(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Hand the page order to qpdf as collapsed ranges when it is installed."""
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 4)
+    commands = []
+
+    def fake_run(command, **_kwargs):
+        commands.append(command)
+        shutil.copyfile(command[2], command[-1])
+        return subprocess.CompletedProcess(command, 0)
+
+    monkeypatch.setattr(shutil, "which", {"qpdf": "/usr/bin/qpdf"}.get)
+    monkeypatch.setattr("zenpdf_worker.tools.subprocess.run", fake_run)
+
+    reorder_pages(source, tmp_path / "reordered.pdf", "4,1-3")
+    remove_pages(source, tmp_path / "removed.pdf", "2")
+
+    assert [command[3:6] for command in commands] == [
+        ["--pages", ".", "4,1-3"],
+        ["--pages", ".", "1,3-4"],
+    ]
+
+
+def test_compare_pdfs(tmp_path: Path) -> None:
     """Generate a comparison report for two PDFs."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        first = temp_path / "first.pdf"
-        second = temp_path / "second.pdf"
-        _make_text_pdf(first, "Alpha")
-        _make_text_pdf(second, "Beta")
+    first = tmp_path / "first.pdf"
+    second = tmp_path / "second.pdf"
+    _make_text_pdf(first, "Alpha")
+    _make_text_pdf(second, "Beta")
+
+    report = compare_pdfs(first, second, tmp_path / "report.txt")
+    report_text = report.read_text(encoding="utf-8")
+    assert "text differs" in report_text
+
+
+def test_compare_pdfs_skips_identical_pages(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Only extract text from pages whose content streams differ."""
+    first = tmp_path / "first.pdf"
+    second = tmp_path / "second.pdf"
+    _make_text_pdf(first, "Alpha")
+    shutil.copyfile(first, second)
+    extracted = []
+    real_get_text = fitz.Page.get_text
+
+    def counting_get_text(page, *args, **kwargs):
+        extracted.append(page.number)
+        return real_get_text(page, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, "get_text", counting_get_text)
+
+    report = compare_pdfs(first, second, tmp_path / "report.txt")
+    assert "No text differences detected." in report.read_text(encoding="utf-8")
+    assert extracted == []
+
+
+def test_compare_pdfs_extracts_pages_with_different_font_programs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Extract text when an identical stream draws with a different embedded font program."""
+    sources = []
+    for name, program in (("first", "helv"), ("second", "tiro")):
+        with fitz.open() as document:
+            page = document.new_page(width=300, height=300)
+            page.insert_font(fontname="F0", fontbuffer=fitz.Font("helv").buffer)
+            page.insert_text((50, 100), "Alpha", fontname="F0")
+            # Without /ToUnicode, text is decoded through the embedded program itself.
+            for xref in range(1, document.xref_length()):
+                if document.xref_get_key(xref, "ToUnicode")[0] != "null":
+                    document.xref_set_key(xref, "ToUnicode", "null")
+                for key in ("FontFile", "FontFile2", "FontFile3"):
+                    kind, value = document.xref_get_key(xref, key)
+                    if kind == "xref":
+                        document.update_stream(int(value.split()[0]), fitz.Font(program).buffer)
+            source = tmp_path / f"{name}.pdf"
+            document.save(str(source))
+        sources.append(source)
+    extracted = []
+    real_get_text = fitz.Page.get_text
+
+    def counting_get_text(page, *args, **kwargs):
+        extracted.append(page.number)
+        return real_get_text(page, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, "get_text", counting_get_text)
+
+    compare_pdfs(sources[0], sources[1], tmp_path / "report.txt")
+    assert extracted == [0, 0]
+
+
+def test_compare_pdfs_detects_cropped_text(tmp_path: Path) -> None:
+    """Report a difference when cropping hides text drawn by an identical stream."""
+    first = tmp_path / "first.pdf"
+    _make_text_pdf(first, "Alpha")
+    second = crop_pdf(first, tmp_path / "cropped.pdf", "100,0,0,0", None)
+
+    report = compare_pdfs(first, second, tmp_path / "report.txt")
+    assert "Page 1: text differs" in report.read_text(encoding="utf-8")
+
+
+def test_pdf_to_text(tmp_path: Path) -> None:
+    """Extract PDF text into a TXT file."""
+    source = tmp_path / "source.pdf"
+    _make_text_pdf(source, "Hello")
 
-        report = compare_pdfs(first, second, temp_path / "report.txt")
-        report_text = report.read_text(encoding="utf-8")
-        assert "text differs" in report_text
+    output = pdf_to_text(source, tmp_path / "output.txt")
+    assert "Hello" in output.read_text(encoding="utf-8")
 
 
-def test_pdf_to_text() -> None:
-    """Extract PDF text into a TXT file."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_text_pdf(source, "Hello")
+def test_pdf_to_text_rejects_unreadable_pdf(tmp_path: Path) -> None:
+    """Surface unreadable input as a user-facing error."""
+    source = tmp_path / "broken.pdf"
+    source.write_bytes(b"not a pdf")
 
-        output = pdf_to_text(source, temp_path / "output.txt")
-        assert "Hello" in output.read_text(encoding="utf-8")
+    with pytest.raises(ValueError, match="corrupted or unreadable"):
+        pdf_to_text(source, tmp_path / "output.txt")
 
 
-def test_html_to_pdf() -> None:
+def test_html_to_pdf(tmp_path: Path) -> None:
     """Render HTML content into a PDF."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        output = html_to_pdf("<h1>Hello</h1><p>ZenPDF</p>", temp_path / "web.pdf")
-        assert output.exists()
-        assert output.stat().st_size > 0
+    output = html_to_pdf("<h1>Hello</h1><p>ZenPDF</p>", tmp_path / "web.pdf")
+    assert output.exists()
+    assert output.stat().st_size > 0
 
+    encoded = html_to_pdf("<p>Café</p>".encode("latin-1"), tmp_path / "bytes.pdf", "latin-1")
+    assert "Café" in (PdfReader(str(encoded)).pages[0].extract_text() or "")
 
-def test_web_to_pdf_fetches_html() -> None:
-    """Fetch HTML over HTTP and render to PDF."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        response = _DummyResponse(b"<p>Example</p>")
-        session = _DummySession(response)
-        with patch("zenpdf_worker.tools.requests.Session", return_value=session), patch(
-            "zenpdf_worker.tools._resolve_public_ip", return_value="93.184.216.34"
-        ):
-            output = web_to_pdf("https://example.com", temp_path / "site.pdf")
-        assert output.exists()
 
+@pytest.fixture
+def web_session() -> Iterator[None]:
+    """Drop the pooled web session so each test sees its own patched Session."""
+    _web_session.cache_clear()
+    yield
+    _web_session.cache_clear()
 
-def test_web_to_pdf_blocks_private_host() -> None:
-    """Reject private hosts for web-to-pdf."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        with patch(
-            "zenpdf_worker.tools._resolve_public_ip",
-            side_effect=ValueError("URL host is not allowed"),
-        ):
-            with pytest.raises(ValueError):
-                web_to_pdf("http://127.0.0.1", temp_path / "blocked.pdf")
 
+@pytest.fixture
+def public_ip(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Resolve every web-to-pdf host to a fixed public address."""
+    monkeypatch.setattr("zenpdf_worker.tools._resolve_public_ip", lambda _host: "93.184.216.34")
 
-def test_web_to_pdf_blocks_redirects() -> None:
-    """Reject redirect responses for web-to-pdf."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        response = _DummyResponse(b"", status_code=302)
+
+@pytest.fixture
+def ok_html_response() -> "_DummyResponse":
+    """Return a successful HTML response."""
+    return _DummyResponse(b"<p>Example</p>")
+
+
+def _serve(monkeypatch: pytest.MonkeyPatch, response: "_DummyResponse") -> List["_DummySession"]:
+    """Route new requests sessions to dummies serving `response`; return those created."""
+    sessions: List[_DummySession] = []
+
+    def factory() -> _DummySession:
         session = _DummySession(response)
-        with patch("zenpdf_worker.tools.requests.Session", return_value=session), patch(
-            "zenpdf_worker.tools._resolve_public_ip", return_value="93.184.216.34"
-        ):
-            with pytest.raises(ValueError):
-                web_to_pdf("https://example.com", temp_path / "redirect.pdf")
+        sessions.append(session)
+        return session
 
+    monkeypatch.setattr("zenpdf_worker.tools.requests.Session", factory)
+    return sessions
 
-def test_web_to_pdf_fallbacks_to_hostname() -> None:
-    """Retry HTTPS requests via hostname when IP handshake fails."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        response = _DummyResponse(b"<p>Example</p>")
 
-        class _FailingSession(_DummySession):
-            def get(self, *_args, **_kwargs):
-                raise requests.exceptions.SSLError("handshake failed")
+@pytest.mark.usefixtures("web_session", "public_ip")
+def test_web_to_pdf_fetches_html(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, ok_html_response: "_DummyResponse"
+) -> None:
+    """Fetch HTML over HTTP and render to PDF."""
+    _serve(monkeypatch, ok_html_response)
+    output = web_to_pdf("https://example.com", tmp_path / "site.pdf")
+    assert output.exists()
 
-        class _SessionFactory:
-            def __init__(self):
-                self.calls = 0
 
-            def __call__(self):
-                self.calls += 1
-                if self.calls == 1:
-                    return _FailingSession(response)
-                return _DummySession(response)
+def test_web_to_pdf_blocks_private_host(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Reject private hosts for web-to-pdf."""
+
+    def reject(_host: str) -> str:
+        raise ValueError("URL host is not allowed")
 
-        factory = _SessionFactory()
+    monkeypatch.setattr("zenpdf_worker.tools._resolve_public_ip", reject)
+    with pytest.raises(ValueError):
+        web_to_pdf("http://127.0.0.1", tmp_path / "blocked.pdf")
 
-        with patch("zenpdf_worker.tools.requests.Session", side_effect=factory), patch(
-            "zenpdf_worker.tools._resolve_public_ip", return_value="93.184.216.34"
-        ), patch.dict(
-            os.environ,
-            {"ZENPDF_WEB_ALLOW_HOSTNAME_FALLBACK": "1", "ZENPDF_DEV_MODE": "1"},
-        ):
-            output = web_to_pdf("https://example.com", temp_path / "site.pdf")
 
-        assert output.exists()
+@pytest.mark.usefixtures("web_session", "public_ip")
+def test_web_to_pdf_blocks_redirects(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Reject redirect responses for web-to-pdf."""
+    _serve(monkeypatch, _DummyResponse(b"", status_code=302))
+    with pytest.raises(ValueError):
+        web_to_pdf("https://example.com", tmp_path / "redirect.pdf")
+
 
+@pytest.mark.usefixtures("web_session", "public_ip")
+def test_web_to_pdf_fallbacks_to_hostname(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, ok_html_response: "_DummyResponse"
+) -> None:
+    """Retry HTTPS requests via hostname when IP handshake fails."""
 
-def test_web_to_pdf_limits_body_size() -> None:
+    class _FailingSession(_DummySession):
+        def get(self, *_args, **_kwargs):
+            raise requests.exceptions.SSLError("handshake failed")
+
+    sessions = iter([_FailingSession(ok_html_response), _DummySession(ok_html_response)])
+    monkeypatch.setattr("zenpdf_worker.tools.requests.Session", lambda: next(sessions))
+    monkeypatch.setenv("ZENPDF_WEB_ALLOW_HOSTNAME_FALLBACK", "1")
+    monkeypatch.setenv("ZENPDF_DEV_MODE", "1")
+
+    output = web_to_pdf("https://example.com", tmp_path / "site.pdf")
+    assert output.exists()
+
+
+@pytest.mark.usefixtures("web_session")
+def test_web_to_pdf_does_not_share_cookies(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Never send a cookie set during one job's fetch on a later job's fetch."""
+    received: List[str | None] = []
+
+    class _CookieHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            received.append(self.headers.get("Cookie"))
+            body = b"<p>Example</p>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Set-Cookie", "session=first-user; Path=/")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args) -> None:
+            return None
+
+    server = HTTPServer(("127.0.0.1", 0), _CookieHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr("zenpdf_worker.tools._resolve_public_ip", lambda _host: "127.0.0.1")
+    url = f"http://localhost:{server.server_port}/"
+    try:
+        web_to_pdf(url, tmp_path / "first.pdf")
+        web_to_pdf(url, tmp_path / "second.pdf")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert received == [None, None]
+
+
+@pytest.mark.usefixtures("web_session", "public_ip")
+def test_web_to_pdf_reuses_pooled_session(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, ok_html_response: "_DummyResponse"
+) -> None:
+    """Share one pooled session across web-to-pdf calls."""
+    sessions = _serve(monkeypatch, ok_html_response)
+    web_to_pdf("https://example.com", tmp_path / "first.pdf")
+    web_to_pdf("https://example.org", tmp_path / "second.pdf")
+    assert len(sessions) == 1
+
+
+@pytest.mark.usefixtures("web_session", "public_ip")
+def test_web_to_pdf_limits_body_size(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Enforce the max response size for web-to-pdf."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        response = _DummyResponse(b"a" * (MAX_WEB_BYTES + 1))
-        session = _DummySession(response)
-        with patch("zenpdf_worker.tools.requests.Session", return_value=session), patch(
-            "zenpdf_worker.tools._resolve_public_ip", return_value="93.184.216.34"
-        ):
-            with pytest.raises(ValueError):
-                web_to_pdf("https://example.com", temp_path / "large.pdf")
+    chunk = b"a" * 4096
+    _serve(monkeypatch, _DummyResponse(chunks=repeat(chunk, MAX_WEB_BYTES // len(chunk) + 1)))
+    with pytest.raises(ValueError):
+        web_to_pdf("https://example.com", tmp_path / "large.pdf")
 
 
-def test_pdf_to_docx_and_xlsx() -> None:
+def test_pdf_to_docx_and_xlsx(tmp_path: Path) -> None:
     """Convert PDF text to DOCX and XLSX files."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 1)
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 1)
 
-        docx_path = pdf_to_docx(source, temp_path / "output.docx")
-        xlsx_path = pdf_to_xlsx(source, temp_path / "output.xlsx")
+    docx_path = pdf_to_docx(source, tmp_path / "output.docx")
+    xlsx_path = pdf_to_xlsx(source, tmp_path / "output.xlsx")
 
-        assert docx_path.exists()
-        assert xlsx_path.exists()
+    assert docx_path.exists()
+    assert xlsx_path.exists()
 
 
-def test_pdf_to_docx_and_xlsx_ocr() -> None:
+def test_pdf_to_docx_and_xlsx_ocr(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Convert a PDF to DOCX/XLSX using OCR."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 2)
-
-        with patch(
-            "zenpdf_worker.tools._ocr_image",
-            side_effect=["First page", "Second page"],
-        ):
-            docx_path = pdf_to_docx_ocr(source, temp_path / "ocr.docx")
-
-        with patch(
-            "zenpdf_worker.tools._ocr_image",
-            side_effect=["First sheet", "Second sheet"],
-        ):
-            xlsx_path = pdf_to_xlsx_ocr(source, temp_path / "ocr.xlsx")
-
-        document = Document(str(docx_path))
-        doc_text = "\n".join(paragraph.text for paragraph in document.paragraphs)
-        assert "First page" in doc_text
-        assert "Second page" in doc_text
-
-        workbook = load_workbook(xlsx_path)
-        sheet = workbook.active
-        values = [cell.value for cell in sheet["A"] if cell.value]
-        assert "First sheet" in values
-        assert "Second sheet" in values
-
-
-def test_compress_pdf_detects_image_heavy(monkeypatch: pytest.MonkeyPatch) -> None:
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 2)
+    monkeypatch.setenv("ZENPDF_OCR_CONCURRENCY", "1")
+
+    page_texts = iter(["First page", "Second page"])
+    monkeypatch.setattr("zenpdf_worker.tools._ocr_image", lambda *_: next(page_texts))
+    docx_path = pdf_to_docx_ocr(source, tmp_path / "ocr.docx")
+
+    sheet_texts = iter(["First sheet", "Second sheet"])
+    monkeypatch.setattr("zenpdf_worker.tools._ocr_image", lambda *_: next(sheet_texts))
+    xlsx_path = pdf_to_xlsx_ocr(source, tmp_path / "ocr.xlsx")
+
+    document = Document(str(docx_path))
+    doc_text = "\n".join(paragraph.text for paragraph in document.paragraphs)
+    assert "First page" in doc_text
+    assert "Second page" in doc_text
+
+    workbook = load_workbook(xlsx_path)
+    sheet = workbook.active
+    values = [cell.value for cell in sheet["A"] if cell.value]
+    assert "First sheet" in values
+    assert "Second sheet" in values
+
+
+def test_pdf_to_docx_ocr_keeps_page_order_when_parallel(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Parallel OCR should return page text in document order."""
+    source = tmp_path / "source.pdf"
+    writer = PdfWriter()
+    for width in (200, 300, 400):
+        writer.add_blank_page(width=width, height=300)
+    with source.open("wb") as handle:
+        writer.write(handle)
+
+    def fake_ocr(image, _lang):
+        # Finish the first page last to exercise out-of-order completion.
+        if image.width < 1000:
+            time.sleep(0.05)
+        return f"Page width {round(image.width * 72 / 300)}"
+
+    monkeypatch.setattr("zenpdf_worker.tools._ocr_image", fake_ocr)
+    monkeypatch.setenv("ZENPDF_OCR_CONCURRENCY", "3")
+    docx_path = pdf_to_docx_ocr(source, tmp_path / "ocr.docx")
+
+    document = Document(str(docx_path))
+    texts = [paragraph.text for paragraph in document.paragraphs if paragraph.text]
+    assert texts == ["Page width 200", "Page width 300", "Page width 400"]
+
+
+def test_compress_pdf_detects_image_heavy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Classify an image-heavy PDF and return compression metadata."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "image.pdf"
-        output = temp_path / "output.pdf"
-        _make_image_pdf(source)
+    source = tmp_path / "image.pdf"
+    output = tmp_path / "output.pdf"
+    _make_image_pdf(source)
 
-        monkeypatch.setattr(shutil, "which", lambda _tool: None)
-        monkeypatch.setenv("ZENPDF_COMPRESS_SAVINGS_THRESHOLD_PCT", "0")
-        monkeypatch.setenv("ZENPDF_COMPRESS_MIN_SAVINGS_BYTES", "0")
-        monkeypatch.setenv("ZENPDF_COMPRESS_AUTO_IMAGE_HEAVY", "1")
-        monkeypatch.setenv("ZENPDF_COMPRESS_TIMEOUT_SECONDS", "5")
+    monkeypatch.setattr(shutil, "which", lambda _tool: None)
+    monkeypatch.setenv("ZENPDF_COMPRESS_SAVINGS_THRESHOLD_PCT", "0")
+    monkeypatch.setenv("ZENPDF_COMPRESS_MIN_SAVINGS_BYTES", "0")
+    monkeypatch.setenv("ZENPDF_COMPRESS_AUTO_IMAGE_HEAVY", "1")
+    monkeypatch.setenv("ZENPDF_COMPRESS_TIMEOUT_SECONDS", "5")
 
-        _, result = compress_pdf(source, output)
-        assert result["image_metrics"]["image_heavy"] is True
+    _, result = compress_pdf(source, output)
+    assert result["image_metrics"]["image_heavy"] is True
 
 
-def test_compress_pdf_detects_text_heavy(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_compress_pdf_detects_text_heavy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Classify a text-heavy PDF and return compression metadata."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "text.pdf"
-        output = temp_path / "output.pdf"
-        _make_text_pdf(source, "Hello ZenPDF")
+    source = tmp_path / "text.pdf"
+    output = tmp_path / "output.pdf"
+    _make_text_pdf(source, "Hello ZenPDF")
+
+    monkeypatch.setattr(shutil, "which", lambda _tool: None)
+    monkeypatch.setenv("ZENPDF_COMPRESS_SAVINGS_THRESHOLD_PCT", "0")
+    monkeypatch.setenv("ZENPDF_COMPRESS_MIN_SAVINGS_BYTES", "0")
+    monkeypatch.setenv("ZENPDF_COMPRESS_AUTO_IMAGE_HEAVY", "1")
+    monkeypatch.setenv("ZENPDF_COMPRESS_TIMEOUT_SECONDS", "5")
+
+    _, result = compress_pdf(source, output)
+    assert result["image_metrics"]["image_heavy"] is False
+
+
+def test_compress_pdf_skips_stages_once_goal_met(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Skip later optimize stages once a candidate meets the savings goal."""
+    source = tmp_path / "image.pdf"
+    output = tmp_path / "output.pdf"
+    _make_image_pdf(source)
+    commands = []
+
+    def fake_run(command, **_kwargs):
+        commands.append(command)
+        _make_pdf(Path(command[-1]), 1)
+        return subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(shutil, "which", {"mutool": "/usr/bin/mutool"}.get)
+    monkeypatch.setattr("zenpdf_worker.tools.subprocess.run", fake_run)
+    monkeypatch.setenv("ZENPDF_COMPRESS_SAVINGS_THRESHOLD_PCT", "0.01")
+    monkeypatch.setenv("ZENPDF_COMPRESS_MIN_SAVINGS_BYTES", "1")
+
+    _, result = compress_pdf(source, output)
+
+    assert [command[1] for command in commands] == ["clean"]
+    assert result["status"] == "success"
+    skipped = {step["name"]: step.get("notes") for step in result["steps"]}
+    assert skipped["optimize_mutool"] == "skipped: already reduced"
+
+
+def test_compress_pdf_skips_zopfli_after_large_savings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Skip the zopfli pass once the chosen output already clears the early-exit savings."""
+    source = tmp_path / "image.pdf"
+    _make_image_pdf(source)
+    envs = []
+
+    def fake_run(command, **kwargs):
+        envs.append(kwargs.get("env"))
+        _make_pdf(Path(command[-1]), 1)
+        return subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(shutil, "which", {"qpdf": "/usr/bin/qpdf"}.get)
+    monkeypatch.setattr("zenpdf_worker.tools.subprocess.run", fake_run)
+    monkeypatch.setenv("ZENPDF_COMPRESS_USE_ZOPFLI", "1")
+    monkeypatch.setenv("ZENPDF_COMPRESS_ZOPFLI_SKIP_SAVINGS_PCT", "0.5")
+    monkeypatch.setenv("ZENPDF_COMPRESS_MIN_SAVINGS_BYTES", "1")
+
+    _, result = compress_pdf(source, tmp_path / "output.pdf")
+
+    assert result["savings_percent"] >= 50
+    assert not any(env and env.get("QPDF_ZOPFLI") for env in envs)
+    skipped = {step["name"]: step.get("notes") for step in result["steps"]}
+    assert skipped["qpdf_zopfli"] == "skipped: savings already sufficient"
+
+
+def test_compress_pdf_probes_long_small_documents(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Keep the Ghostscript timing probe for small files with many pages."""
+    source = tmp_path / "long.pdf"
+    _make_pdf(source, 300)
+    commands = []
+
+    def fake_run(command, **_kwargs):
+        commands.append(command)
+        outputs = [arg for arg in command if arg.startswith("-sOutputFile=")]
+        if outputs:
+            shutil.copyfile(source, outputs[0].split("=", 1)[1])
+        return subprocess.CompletedProcess(command, 0, stdout=b"", stderr=b"")
+
+    monkeypatch.setattr(shutil, "which", {"gs": "/usr/bin/gs"}.get)
+    monkeypatch.setattr("zenpdf_worker.tools.subprocess.run", fake_run)
+    monkeypatch.setenv("ZENPDF_COMPRESS_GS_MIN_SIZE_MB", "0")
+    monkeypatch.setenv("ZENPDF_COMPRESS_AUTO_IMAGE_HEAVY", "0")
+
+    _, result = compress_pdf(source, tmp_path / "output.pdf")
+
+    assert any("-dLastPage=5" in command for command in commands)
+    probe = next(step for step in result["steps"] if step["name"] == "ghostscript_probe")
+    assert probe.get("notes") != "skipped: small document"
+
+
+def test_compress_pdf_skips_identical_candidates(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Skip validating candidates that are byte-identical to an accepted one."""
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 2)
+
+    def fake_run(command, **_kwargs):
+        if command[1] == "merge":  # mutool merge -o <output> -O compress <input>
+            shutil.copyfile(command[-1], command[3])
+        else:  # mutool clean ... <input> <output>
+            shutil.copyfile(command[-2], command[-1])
+        return subprocess.CompletedProcess(command, 0, stdout=b"", stderr=b"")
 
-        monkeypatch.setattr(shutil, "which", lambda _tool: None)
-        monkeypatch.setenv("ZENPDF_COMPRESS_SAVINGS_THRESHOLD_PCT", "0")
-        monkeypatch.setenv("ZENPDF_COMPRESS_MIN_SAVINGS_BYTES", "0")
-        monkeypatch.setenv("ZENPDF_COMPRESS_AUTO_IMAGE_HEAVY", "1")
-        monkeypatch.setenv("ZENPDF_COMPRESS_TIMEOUT_SECONDS", "5")
+    opened = []
+    real_open = fitz.open
+
+    def counting_open(*args, **kwargs):
+        opened.append(args)
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr(shutil, "which", {"mutool": "/usr/bin/mutool"}.get)
+    monkeypatch.setattr("zenpdf_worker.tools.subprocess.run", fake_run)
+    monkeypatch.setattr("zenpdf_worker.tools.fitz.open", counting_open)
+
+    _, result = compress_pdf(source, tmp_path / "output.pdf")
 
-        _, result = compress_pdf(source, output)
-        assert result["image_metrics"]["image_heavy"] is False
+    assert result["status"] == "no_change"
+    assert opened == [(str(source),)]
 
 
-def test_compress_pdf_rejects_encrypted_pdf(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_compress_pdf_links_unchanged_output(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Hard-link the original into place instead of copying it when nothing shrank."""
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 1)
+    monkeypatch.setattr(shutil, "which", lambda _name: None)
+
+    output, result = compress_pdf(source, tmp_path / "output.pdf")
+
+    assert result["status"] == "no_change"
+    assert output.stat().st_ino == source.stat().st_ino
+    assert output.read_bytes() == source.read_bytes()
+
+
+def test_compress_pdf_removes_intermediates_on_failure(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Remove intermediate files when no compression candidate is valid."""
+    source = tmp_path / "broken.pdf"
+    source.write_bytes(b"%PDF-1.7\nnot a document")
+
+    def fake_run(command, **_kwargs):
+        Path(command[-1]).write_bytes(b"%PDF-1.7\n")
+        return subprocess.CompletedProcess(command, 0, stdout=b"", stderr=b"")
+
+    monkeypatch.setattr(shutil, "which", {"mutool": "/usr/bin/mutool"}.get)
+    monkeypatch.setattr("zenpdf_worker.tools.subprocess.run", fake_run)
+
+    with pytest.raises(ValueError, match="malformed structure"):
+        compress_pdf(source, tmp_path / "output.pdf")
+    assert [path.name for path in tmp_path.iterdir()] == ["broken.pdf"]
+
+
+def test_compress_pdf_rejects_encrypted_pdf(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
     """Reject encrypted PDFs before compression."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "encrypted.pdf"
-        output = temp_path / "output.pdf"
-        writer = PdfWriter()
-        writer.add_blank_page(width=300, height=300)
-        writer.encrypt("secret")
-        with source.open("wb") as handle:
-            writer.write(handle)
+    source = tmp_path / "encrypted.pdf"
+    output = tmp_path / "output.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=300, height=300)
+    writer.encrypt("secret")
+    with source.open("wb") as handle:
+        writer.write(handle)
 
-        monkeypatch.setattr(shutil, "which", lambda _tool: None)
-        with pytest.raises(ValueError, match="PDF is encrypted"):
-            compress_pdf(source, output)
+    monkeypatch.setattr(shutil, "which", lambda _tool: None)
+    with pytest.raises(ValueError, match="PDF is encrypted"):
+        compress_pdf(source, output)
 
 
-def test_pdfa_requires_ghostscript(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_pdfa_requires_ghostscript(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Fail when Ghostscript is not available for PDF/A conversion."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 1)
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 1)
 
-        monkeypatch.setattr("zenpdf_worker.tools.shutil.which", lambda _: None)
-        with pytest.raises(RuntimeError):
-            pdf_to_pdfa(source, temp_path / "output.pdf")
+    monkeypatch.setattr("zenpdf_worker.tools.shutil.which", lambda _: None)
+    with pytest.raises(RuntimeError):
+        pdf_to_pdfa(source, tmp_path / "output.pdf")
 
 
-def test_pdfa_conversion_runs_ghostscript(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_pdfa_conversion_runs_ghostscript(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Run PDF/A conversion through Ghostscript."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        output = temp_path / "output.pdf"
-        _make_pdf(source, 1)
+    source = tmp_path / "source.pdf"
+    output = tmp_path / "output.pdf"
+    _make_pdf(source, 1)
 
-        monkeypatch.setattr("zenpdf_worker.tools.shutil.which", lambda _: "/usr/bin/gs")
+    monkeypatch.setattr("zenpdf_worker.tools.shutil.which", lambda _: "/usr/bin/gs")
 
-        def fake_run(command, **_kwargs):
-            if "--version" in command:
-                return subprocess.CompletedProcess(command, 0, stdout="10.03.1", stderr="")
-            output.write_bytes(b"%PDF-1.7\n")
-            return subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+    version_checks = []
 
-        monkeypatch.setattr("zenpdf_worker.tools.subprocess.run", fake_run)
+    def fake_run(command, **_kwargs):
+        if "--version" in command:
+            version_checks.append(command)
+            return subprocess.CompletedProcess(command, 0, stdout="10.03.1", stderr="")
+        output.write_bytes(b"%PDF-1.7\n")
+        return subprocess.CompletedProcess(command, 0, stdout="", stderr="")
 
-        result = pdf_to_pdfa(source, output)
-        assert result.exists()
+    monkeypatch.setattr("zenpdf_worker.tools.subprocess.run", fake_run)
+    _ghostscript_version.cache_clear()
 
+    result = pdf_to_pdfa(source, output)
+    pdf_to_pdfa(source, output)
+    _ghostscript_version.cache_clear()
+    assert result.exists()
+    assert len(version_checks) == 1
 
-def test_pdfa_rejects_encrypted_pdf() -> None:
+
+def test_pdfa_rejects_encrypted_pdf(tmp_path: Path) -> None:
     """Reject encrypted PDFs before invoking Ghostscript."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "encrypted.pdf"
-        writer = PdfWriter()
-        writer.add_blank_page(width=300, height=300)
-        writer.encrypt("secret")
-        with source.open("wb") as handle:
-            writer.write(handle)
+    source = tmp_path / "encrypted.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=300, height=300)
+    writer.encrypt("secret")
+    with source.open("wb") as handle:
+        writer.write(handle)
 
-        with pytest.raises(ValueError):
-            pdf_to_pdfa(source, temp_path / "output.pdf")
+    with pytest.raises(ValueError):
+        pdf_to_pdfa(source, tmp_path / "output.pdf")
 
 
-def test_office_to_pdf_missing_soffice(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Fail when LibreOffice is not available."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        doc_path = temp_path / "sample.docx"
-        document = Document()
-        document.add_paragraph("Hello")
-        document.save(doc_path)
+def test_pdfa_rejects_owner_password_pdf(tmp_path: Path) -> None:
+    """Treat PDFs with only an owner password as encrypted for PDF/A."""
+    source = tmp_path / "owner.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=300, height=300)
+    writer.encrypt("", owner_password="owner")
+    with source.open("wb") as handle:
+        writer.write(handle)
 
-        monkeypatch.setattr("zenpdf_worker.tools.shutil.which", lambda _: None)
-        with pytest.raises(RuntimeError):
-            office_to_pdf(doc_path, temp_path)
+    with pytest.raises(ValueError, match="Encrypted PDFs"):
+        pdf_to_pdfa(source, tmp_path / "output.pdf")
 
 
-def test_word_powerpoint_excel_to_pdf_extension_validation() -> None:
+def test_office_to_pdf_missing_soffice(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fail when LibreOffice is not available."""
+    doc_path = tmp_path / "sample.docx"
+    doc_path.write_bytes(_sample_docx_bytes())
+
+    monkeypatch.setattr("zenpdf_worker.tools.shutil.which", lambda _: None)
+    with pytest.raises(RuntimeError):
+        office_to_pdf(doc_path, tmp_path)
+
+
+def test_office_to_pdf_reuses_profile(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Run every LibreOffice conversion against the same warm user profile."""
+    doc_path = tmp_path / "sample.docx"
+    doc_path.write_bytes(_sample_docx_bytes())
+    commands = []
+
+    def fake_run(command, **kwargs):
+        commands.append(command)
+        _make_pdf(Path(command[command.index("--outdir") + 1]) / "sample.pdf", 1)
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    _soffice_profile_dir.cache_clear()
+    monkeypatch.setenv("ZENPDF_SOFFICE_PROFILE_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setattr("zenpdf_worker.tools.shutil.which", lambda _: "/usr/bin/soffice")
+    monkeypatch.setattr("zenpdf_worker.tools.subprocess.run", fake_run)
+    try:
+        office_to_pdf(doc_path, tmp_path / "first")
+        office_to_pdf(doc_path, tmp_path / "second")
+    finally:
+        _soffice_profile_dir.cache_clear()
+
+    profiles = {command[1] for command in commands}
+    assert len(profiles) == 1
+    assert profiles.pop().startswith("-env:UserInstallation=file://")
+
+
+@pytest.mark.parametrize("converter", [word_to_pdf, powerpoint_to_pdf, excel_to_pdf])
+def test_word_powerpoint_excel_to_pdf_extension_validation(
+    tmp_path: Path, converter: Callable[[Path, Path], Path]
+) -> None:
     """Reject unsupported source extensions for split Office conversion tools."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "sample.txt"
-        source.write_text("not office", encoding="utf-8")
-        with pytest.raises(ValueError):
-            word_to_pdf(source, temp_path)
-        with pytest.raises(ValueError):
-            powerpoint_to_pdf(source, temp_path)
-        with pytest.raises(ValueError):
-            excel_to_pdf(source, temp_path)
-
-
-def test_organize_pdf_order_delete_rotate() -> None:
+    source = tmp_path / "sample.txt"
+    source.write_text("not office", encoding="utf-8")
+    with pytest.raises(ValueError):
+        converter(source, tmp_path)
+
+
+def test_organize_pdf_order_delete_rotate(tmp_path: Path) -> None:
     """Apply organize operation in deterministic delete->order->rotate behavior."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_text_pdf(source, "one")
-        # build 3-page input
-        page_two = temp_path / "two.pdf"
-        page_three = temp_path / "three.pdf"
-        _make_text_pdf(page_two, "two")
-        _make_text_pdf(page_three, "three")
-        merge_pdfs([source, page_two, page_three], source)
-
-        output = organize_pdf(
-            source,
-            temp_path / "organized.pdf",
-            order="3,1,2",
-            delete="2",
-            rotate="3:90",
-        )
-        reader = PdfReader(str(output))
-        assert len(reader.pages) == 2
+    source = tmp_path / "source.pdf"
+    _make_text_pdf(source, "one")
+    # build 3-page input
+    page_two = tmp_path / "two.pdf"
+    page_three = tmp_path / "three.pdf"
+    _make_text_pdf(page_two, "two")
+    _make_text_pdf(page_three, "three")
+    merge_pdfs([source, page_two, page_three], source)
+
+    output = organize_pdf(
+        source,
+        tmp_path / "organized.pdf",
+        order="3,1,2",
+        delete="2",
+        rotate="3:90",
+    )
+    assert _pdf_quickinfo(output).n_pages == 2
+
+
+@pytest.mark.parametrize(
+    "transform",
+    [
+        lambda source, output: organize_pdf(source, output, order="1", rotate="1:90"),
+        lambda source, output: remove_pages(source, output, "2"),
+        lambda source, output: reorder_pages(source, output, "2,1"),
+    ],
+    ids=["organize", "remove_pages", "reorder_pages"],
+)
+def test_page_tools_reject_owner_password_pdf(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    transform: Callable[[Path, Path], Path],
+) -> None:
+    """Refuse to rewrite owner-password-only PDFs, which would drop their encryption."""
+    source = tmp_path / "owner.pdf"
+    writer = PdfWriter()
+    for _ in range(2):
+        writer.add_blank_page(width=300, height=300)
+    writer.encrypt("", owner_password="owner")
+    with source.open("wb") as handle:
+        writer.write(handle)
+    monkeypatch.setattr(shutil, "which", lambda _: None)
+
+    with pytest.raises(ValueError, match="PDF is encrypted"):
+        transform(source, tmp_path / "output.pdf")
+
+
+def test_remove_pages_rejects_removing_every_page(tmp_path: Path) -> None:
+    """Refuse a removal that would leave an empty document."""
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 2)
 
+    with pytest.raises(ValueError, match="Cannot remove every page"):
+        remove_pages(source, tmp_path / "removed.pdf", "1-2")
 
-def test_edit_pdf_add_text_and_delete_pages() -> None:
+
+def test_edit_pdf_add_text_and_delete_pages(tmp_path: Path) -> None:
     """Apply edit operations including text insertion and page deletion."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 2)
-        operations = [
-            {"op": "add_text", "page": 1, "x": 72, "y": 72, "text": "Approved"},
-            {"op": "delete_pages", "pages": "2"},
-        ]
-        edited = edit_pdf(source, temp_path / "edited.pdf", operations)
-        reader = PdfReader(str(edited))
-        assert len(reader.pages) == 1
-        assert "Approved" in (reader.pages[0].extract_text() or "")
-
-
-def test_sign_pdf_adds_signature_stamp() -> None:
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 2)
+    operations = [
+        {"op": "add_text", "page": 1, "x": 72, "y": 72, "text": "Approved"},
+        {"op": "delete_pages", "pages": "2"},
+    ]
+    edited = edit_pdf(source, tmp_path / "edited.pdf", operations)
+    reader = PdfReader(str(edited))
+    assert len(reader.pages) == 1
+    assert "Approved" in (reader.pages[0].extract_text() or "")
+
+
+def test_sign_pdf_adds_signature_stamp(tmp_path: Path) -> None:
     """Apply visible signature text to selected pages."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 1)
-        signed = sign_pdf(source, temp_path / "signed.pdf", "Jane Doe")
-        reader = PdfReader(str(signed))
-        assert "Signed: Jane Doe" in (reader.pages[0].extract_text() or "")
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 1)
+    signed = sign_pdf(source, tmp_path / "signed.pdf", "Jane Doe")
+    reader = PdfReader(str(signed))
+    assert "Signed: Jane Doe" in (reader.pages[0].extract_text() or "")
 
 
-def test_scan_to_pdf_alias() -> None:
+def test_scan_to_pdf_alias(tmp_path: Path) -> None:
     """Scan-to-PDF should produce a merged PDF from images."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        image_path = temp_path / "scan.png"
-        image = Image.new("RGB", (200, 200), color=(120, 140, 180))
-        image.save(image_path)
-        output = scan_to_pdf([image_path], temp_path / "scan.pdf")
-        assert output.exists()
+    image_path = tmp_path / "scan.png"
+    image_path.write_bytes(_sample_png_bytes())
+    output = scan_to_pdf([image_path], tmp_path / "scan.pdf")
+    assert output.exists()
 
 
-def test_ocr_pdf_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_ocr_pdf_fallback(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Fallback OCR path should create a searchable PDF when ocrmypdf is unavailable."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_image_pdf(source)
-
-        monkeypatch.setenv("ZENPDF_OCR_USE_OCRMYPDF", "0")
-
-        class _FakePytesseract:
-            @staticmethod
-            def image_to_pdf_or_hocr(_image, extension="pdf", lang="eng"):
-                assert extension == "pdf"
-                assert lang == "eng"
-                writer = PdfWriter()
-                writer.add_blank_page(width=300, height=300)
-                buffer = BytesIO()
-                writer.write(buffer)
-                return buffer.getvalue()
-
-        with patch("zenpdf_worker.tools.pytesseract", _FakePytesseract):
-            output = ocr_pdf(source, temp_path / "ocr.pdf", "eng")
-        assert output.exists()
-        assert output.stat().st_size > 0
-
-
-def test_pdf_to_powerpoint() -> None:
+    source = tmp_path / "source.pdf"
+    _make_image_pdf(source)
+
+    monkeypatch.setenv("ZENPDF_OCR_USE_OCRMYPDF", "0")
+
+    class _FakePytesseract:
+        @staticmethod
+        def image_to_pdf_or_hocr(_image, extension="pdf", lang="eng"):
+            assert extension == "pdf"
+            assert lang == "eng"
+            writer = PdfWriter()
+            writer.add_blank_page(width=300, height=300)
+            buffer = BytesIO()
+            writer.write(buffer)
+            return buffer.getvalue()
+
+    monkeypatch.setattr("zenpdf_worker.tools.pytesseract", _FakePytesseract)
+    output = ocr_pdf(source, tmp_path / "ocr.pdf", "eng")
+    assert output.exists()
+    assert output.stat().st_size > 0
+
+
+def test_pdf_to_powerpoint(tmp_path: Path) -> None:
     """Convert a PDF into PPTX (or surface dependency requirement)."""
-    with TemporaryDirectory() as temp:
-        temp_path = Path(temp)
-        source = temp_path / "source.pdf"
-        _make_pdf(source, 1)
-        output = temp_path / "slides.pptx"
-        try:
-            result = pdf_to_powerpoint(source, output)
-        except RuntimeError as error:
-            assert "python-pptx is required" in str(error)
-            return
-        assert result.exists()
-        assert result.stat().st_size > 0
+    source = tmp_path / "source.pdf"
+    _make_pdf(source, 1)
+    output = tmp_path / "slides.pptx"
+    try:
+        result = pdf_to_powerpoint(source, output)
+    except RuntimeError as error:
+        assert "python-pptx is required" in str(error)
+        return
+    assert result.exists()
+    assert result.stat().st_size > 0
 
 
 class _DummySocket:
     """Mock socket for response peer IP retrieval."""
+    __slots__ = ("_ip",)
+
     def __init__(self, ip: str) -> None:
         """Initialize the mock socket with an IP."""
         self._ip = ip
@@ -703,6 +1248,8 @@ class _DummySocket:
 
 class _DummyConnection:
     """Mock connection wrapper."""
+    __slots__ = ("sock",)
+
     def __init__(self, ip: str) -> None:
         """Initialize the dummy connection with the socket."""
         self.sock = _DummySocket(ip)
@@ -710,6 +1257,8 @@ class _DummyConnection:
 
 class _DummyRaw:
     """Mock raw response wrapper."""
+    __slots__ = ("_connection",)
+
     def __init__(self, ip: str) -> None:
         """Initialize the raw wrapper with a connection."""
         self._connection = _DummyConnection(ip)
@@ -717,16 +1266,31 @@ class _DummyRaw:
 
 class _DummyResponse:
     """Mock response used for web-to-pdf tests."""
-    def __init__(self, body: bytes, status_code: int = 200, ip: str = "93.184.216.34") -> None:
-        """Initialize the dummy response payload."""
+    __slots__ = ("_body", "_chunks", "status_code", "encoding", "raw")
+
+    def __init__(
+        self,
+        body: bytes = b"",
+        status_code: int = 200,
+        ip: str = "93.184.216.34",
+        *,
+        chunks: Iterable[bytes] | None = None,
+    ) -> None:
+        """Initialize the dummy response payload, optionally as a stream of chunks."""
         self._body = body
+        self._chunks = chunks
         self.status_code = status_code
         self.encoding = "utf-8"
         self.raw = _DummyRaw(ip)
 
-    def iter_content(self, _chunk_size: int = 1024, **_kwargs):
-        """Yield the body payload as a single chunk."""
-        yield self._body
+    def iter_content(self, chunk_size: int = 1024, **_kwargs):
+        """Yield the explicit chunks, or zero-copy `chunk_size` slices of the body."""
+        if self._chunks is not None:
+            yield from self._chunks
+            return
+        view = memoryview(self._body)
+        for start in range(0, len(view), chunk_size):
+            yield view[start : start + chunk_size]
 
     def raise_for_status(self) -> None:
         """Raise when the status indicates an error."""
@@ -744,9 +1308,12 @@ class _DummyResponse:
 
 class _DummySession:
     """Mock requests session wrapper."""
+    __slots__ = ("_response", "cookies")
+
     def __init__(self, response: _DummyResponse) -> None:
         """Initialize the dummy session."""
         self._response = response
+        self.cookies = requests.cookies.RequestsCookieJar()
 
     def __enter__(self):
         """Enter the session context manager."""
@@ -1,10 +1,96 @@
 """Convex HTTP client helpers for the worker."""
 
 import json
+import socket
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional faster JSON codec
+    orjson = None
+
+MAX_ERROR_BODY_BYTES = 4096
+
+# Failed connects never reach Convex, so every call may retry them.
+CONNECT_RETRY = Retry(
+    total=3, connect=3, read=0, status=0, other=0, backoff_factor=0.2, backoff_jitter=0.1
+)
+# Queries are read-only, so they may also retry transient gateway statuses; mutations
+# are not (a lost response does not mean the mutation did not run).
+QUERY_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=2,
+    status=3,
+    other=0,
+    backoff_factor=0.2,
+    backoff_jitter=0.1,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a request body to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _keepalive_socket_options() -> List[Tuple[int, int, int]]:
+    """Return urllib3's defaults (TCP_NODELAY) plus TCP keepalive probing."""
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 15), ("TCP_KEEPCNT", 4)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTP adapter whose pooled sockets probe idle peers with TCP keepalive."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """Create the pool manager with keepalive socket options."""
+        kwargs["socket_options"] = _keepalive_socket_options()
+        super().init_poolmanager(*args, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def _default_session(url: str) -> requests.Session:
+    """
+    Return the process-wide session whose connection pool clients of `url` share.
+
+    Queries to the deployment get the more forgiving QUERY_RETRY policy through a second
+    adapter that reuses the first adapter's pool manager, so they still share warm
+    connections with mutations.
+    """
+    session = requests.Session()
+    adapter = _KeepAliveAdapter(max_retries=CONNECT_RETRY)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    query_adapter = _KeepAliveAdapter(max_retries=QUERY_RETRY)
+    query_adapter.poolmanager = adapter.poolmanager
+    session.mount(f"{url}/api/query", query_adapter)
+    return session
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a JSON response body."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 @dataclass
@@ -22,11 +108,47 @@ class ConvexError(Exception):
 class ConvexClient:
     """Minimal HTTP client for Convex query/mutation calls."""
 
-    def __init__(self, url: str, auth_token: Optional[str] = None) -> None:
-        """Initialize the client with a deployment URL and optional JWT."""
+    __slots__ = (
+        "url",
+        "auth_token",
+        "session",
+        "_headers",
+        "_urls",
+        "_query_cache",
+        "_query_cache_size",
+        "_query_cache_ttl",
+    )
+
+    # 560 carries a Convex function error payload rather than a transport failure.
+    _OK_STATUSES = frozenset({200, 560})
+
+    def __init__(
+        self,
+        url: str,
+        auth_token: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        query_cache_ttl: float = 0.0,
+        query_cache_size: int = 128,
+    ) -> None:
+        """
+        Initialize the client with a deployment URL and optional JWT.
+
+        Clients of the same deployment share one pooled session (and its warm keep-alive
+        connections) unless `session` is given, which is then used as is; per-client headers
+        are sent with each request instead of being set on the shared session. A positive
+        `query_cache_ttl` (seconds) keeps up to `query_cache_size` recent query results in
+        memory; mutations are never cached.
+        """
         self.url = url.rstrip("/")
         self.auth_token = auth_token
-        self.session = requests.Session()
+        self.session = session or _default_session(self.url)
+        self._headers = {"Content-Type": "application/json", "Convex-Client": "zenpdf-worker"}
+        if auth_token:
+            self._headers["Authorization"] = f"Bearer {auth_token}"
+        self._urls = {kind: f"{self.url}/api/{kind}" for kind in ("query", "mutation")}
+        self._query_cache: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._query_cache_size = query_cache_size
+        self._query_cache_ttl = query_cache_ttl
 
     def _call(self, kind: str, path: str, args: Dict[str, Any]) -> Any:
         """Call a Convex query or mutation endpoint."""
@@ -35,30 +157,40 @@ class ConvexClient:
             "format": "convex_encoded_json",
             "args": [args],
         }
-        headers = {
-            "Content-Type": "application/json",
-            "Convex-Client": "zenpdf-worker",
-        }
-        if self.auth_token:
-            headers["Authorization"] = f"Bearer {self.auth_token}"
-
         response = self.session.post(
-            f"{self.url}/api/{kind}",
-            data=json.dumps(body),
-            headers=headers,
-            timeout=60,
+            self._urls[kind], data=_dumps(body), headers=self._headers, timeout=60
         )
-        if response.status_code not in (200, 560):
-            raise RuntimeError(response.text)
+        raw = response.content
+        if response.status_code not in self._OK_STATUSES:
+            # Skip charset detection over arbitrarily large gateway/HTML error pages.
+            raise RuntimeError(raw[:MAX_ERROR_BODY_BYTES].decode("utf-8", errors="replace"))
 
-        payload = response.json()
+        payload = _loads(raw)
         if payload.get("status") == "success":
             return payload.get("value")
         raise ConvexError(payload.get("errorMessage", "Unknown error"), payload.get("errorData"))
 
-    def query(self, path: str, args: Dict[str, Any]) -> Any:
-        """Execute a Convex query."""
-        return self._call("query", path, args)
+    def query(self, path: str, args: Dict[str, Any], nocache: bool = False) -> Any:
+        """Execute a Convex query, serving repeats from the TTL cache when enabled."""
+        if nocache or self._query_cache_ttl <= 0:
+            return self._call("query", path, args)
+        try:
+            key: Hashable = (path, tuple(sorted(args.items())))
+            hash(key)
+        except TypeError:
+            return self._call("query", path, args)
+
+        now = time.monotonic()
+        cached = self._query_cache.get(key)
+        if cached is not None and now - cached[0] < self._query_cache_ttl:
+            self._query_cache.move_to_end(key)
+            return cached[1]
+        value = self._call("query", path, args)
+        self._query_cache[key] = (now, value)
+        self._query_cache.move_to_end(key)
+        while len(self._query_cache) > self._query_cache_size:
+            self._query_cache.popitem(last=False)
+        return value
 
     def mutation(self, path: str, args: Dict[str, Any]) -> Any:
         """Execute a Convex mutation."""
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import hashlib
+import http.cookiejar
 import ipaddress
 import math
+import mmap
+import multiprocessing
 import os
 import json
 import shlex
@@ -12,13 +16,15 @@ import socket
 import subprocess
 import tempfile
 import time
-import uuid
 import zipfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager, nullcontext
+from functools import lru_cache
 from html.parser import HTMLParser
 from io import BytesIO
+from itertools import count
 from pathlib import Path
-from typing import Any, Callable, Iterable, List, Sequence, Tuple
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, Sequence, Tuple
 from urllib.parse import urlparse
 
 import img2pdf
@@ -28,7 +34,7 @@ from docx import Document
 from fpdf import FPDF
 from openpyxl import Workbook
 from PIL import Image
-from pypdf import PdfReader, PdfWriter, Transformation
+from pypdf import PdfReader, PdfWriter
 from pypdf.errors import PdfReadError
 from requests_toolbelt.adapters.host_header_ssl import HostHeaderSSLAdapter
 
@@ -45,6 +51,18 @@ except ImportError:  # pragma: no cover - optional dependency for PPTX output
 
 OCR_DPI = 300
 DEFAULT_OCR_LANG = os.getenv("ZENPDF_OCR_LANG", "eng")
+QPDF_TIMEOUT_SEC = 120
+SEARCH_PARALLEL_MIN_PAGES = 200
+RENDER_PARALLEL_MIN_PAGES = 32
+WRITE_BUFFER_BYTES = 1 << 20
+
+
+_RUN_IDS = count()
+
+
+def _run_id() -> str:
+    """Return an id for temp-file names, unique within this host's live processes."""
+    return f"{os.getpid():x}{next(_RUN_IDS):06x}"
 
 
 def _parse_ranges(value: str, total_pages: int) -> List[Tuple[int, int]]:
@@ -83,7 +101,29 @@ def _parse_page_list(value: str, total_pages: int) -> List[int]:
     pages: List[int] = []
     for start, end in _parse_ranges(value, total_pages):
         pages.extend(range(start, end + 1))
-    return [page for page in pages if 1 <= page <= total_pages]
+    return pages
+
+
+@contextmanager
+def _mapped_pdf(input_path: Path) -> Iterator[mmap.mmap | BinaryIO]:
+    """
+    Memory-map a PDF read-only so pypdf pages bytes in on demand.
+
+    pypdf copies path inputs onto the heap; a mapping avoids that copy. The file
+    must not be truncated or rewritten while the mapping is open.
+    """
+    with input_path.open("rb") as handle:
+        try:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            mapped = None
+    if mapped is None:
+        yield BytesIO()
+        return
+    try:
+        yield mapped
+    finally:
+        mapped.close()
 
 
 def _load_pdf(input_path: Path, allow_encrypted: bool = False) -> PdfReader:
@@ -97,24 +137,115 @@ def _load_pdf(input_path: Path, allow_encrypted: bool = False) -> PdfReader:
     return reader
 
 
-def _resolve_page_selection(pages: str | None, total_pages: int) -> set[int] | None:
+@lru_cache(maxsize=256)
+def _page_selection(value: str, total_pages: int) -> frozenset[int]:
+    """Parse a non-empty page selection; cached since batch jobs repeat the same strings."""
+    selection = _parse_page_list(value, total_pages)
+    if not selection:
+        raise ValueError("No valid pages selected")
+    return frozenset(selection)
+
+
+def _resolve_page_selection(pages: str | None, total_pages: int) -> frozenset[int] | None:
     """Return a validated set of target pages or None for all."""
     if pages is None:
         return None
     value = str(pages).strip()
     if not value:
         return None
-    selection = _parse_page_list(value, total_pages)
-    if not selection:
-        raise ValueError("No valid pages selected")
-    return set(selection)
+    return _page_selection(value, total_pages)
+
+
+def _load_fitz(input_path: Path) -> fitz.Document:
+    """
+    Open a PDF with PyMuPDF, rejecting unreadable or encrypted input.
+
+    MuPDF opens owner-password-only files without a password and does not report them
+    as encrypted, so the trailer's /Encrypt entry is checked as well; saving such a file
+    would silently drop its owner password and permission restrictions.
+    """
+    try:
+        document = fitz.open(str(input_path), filetype="pdf")
+    except fitz.FileDataError as error:
+        raise ValueError("PDF appears to be corrupted or unreadable.") from error
+    try:
+        _assert_fitz_unencrypted(document)
+        if document.xref_get_key(-1, "Encrypt")[0] != "null":
+            raise ValueError("PDF is encrypted")
+    except ValueError:
+        document.close()
+        raise
+    return document
+
 
+def _has_encrypt_dictionary(input_path: Path) -> bool:
+    """
+    Return True if the PDF trailer references an /Encrypt dictionary.
+
+    MuPDF reads only the cross-reference data to answer this, which is much cheaper
+    than a full pypdf parse. Unlike `is_encrypted`, owner-password-only files count.
+    """
+    try:
+        with fitz.open(str(input_path), filetype="pdf") as document:
+            kind, _value = document.xref_get_key(-1, "Encrypt")
+    except fitz.FileDataError as error:
+        raise ValueError("PDF appears to be corrupted or unreadable.") from error
+    return kind != "null"
 
-def _copy_metadata(writer: PdfWriter, reader: PdfReader) -> None:
-    """Copy metadata from a PDF reader into a writer."""
-    metadata = reader.metadata or {}
-    if metadata:
-        writer.add_metadata(metadata)
+
+def _format_qpdf_ranges(pages: Iterable[int]) -> str:
+    """Collapse 1-based page numbers into a qpdf page-range string (e.g. "1-3,7")."""
+    return _format_qpdf_page_order(sorted(set(pages)))
+
+
+def _format_qpdf_page_order(pages: Sequence[int]) -> str:
+    """Collapse ascending runs of an ordered 1-based page list (e.g. [3, 1, 2] -> "3,1-2")."""
+    parts: List[str] = []
+    run_start: int | None = None
+    previous: int | None = None
+    for page in pages:
+        if run_start is None:
+            run_start = page
+        elif page != previous + 1:
+            parts.append(f"{run_start}-{previous}" if previous != run_start else str(run_start))
+            run_start = page
+        previous = page
+    if run_start is not None:
+        parts.append(f"{run_start}-{previous}" if previous != run_start else str(run_start))
+    return ",".join(parts)
+
+
+@lru_cache(maxsize=None)
+def _tool_path(name: str) -> str | None:
+    """
+    Resolve an external tool on PATH.
+
+    Cached per process: the worker image's tools do not move while it runs, and
+    each `shutil.which` call stats every PATH entry.
+    """
+    return shutil.which(name)
+
+
+def _run_qpdf(args: Sequence[str], timeout: int = QPDF_TIMEOUT_SEC) -> bool:
+    """
+    Run qpdf with the given arguments when it is installed.
+
+    Returns True only when qpdf exited cleanly, so callers can fall back to pypdf.
+    """
+    qpdf = _tool_path("qpdf")
+    if not qpdf:
+        return False
+    try:
+        result = subprocess.run(
+            [qpdf, "--warning-exit-0", *args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return False
+    return result.returncode == 0
 
 
 def _assert_fitz_unencrypted(document: fitz.Document) -> None:
@@ -182,68 +313,70 @@ def _points_to_mm(points: float) -> float:
     return points * 25.4 / 72
 
 
-def _build_overlay_page(
-    width_points: float,
-    height_points: float,
-    draw_fn: Callable[[FPDF, float, float], None],
-):
+def _insert_overlay_text(
+    page: fitz.Page,
+    text: str,
+    center: fitz.Point,
+    font_size: float,
+    gray: float,
+    font_path: Path | None,
+    angle: float = 0.0,
+) -> None:
+    """
+    Draw `text` centered on `center`, rotated about it by `angle` degrees (MuPDF's convention).
+
+    MuPDF appends the text to the page's own content stream, so no overlay PDF is built
+    or merged. Coordinates are in unrotated page space, like the content stream itself.
     """
-    Create a single-page PDF overlay sized to the given page dimensions and rendered by the provided draw callback.
-    
-    Parameters:
-        width_points (float): Page width in PDF points.
-        height_points (float): Page height in PDF points.
-        draw_fn (Callable[[FPDF, float, float], None]): Callback that draws onto an FPDF instance; called with the FPDF object and the page width and height in millimeters.
-    
-    Returns:
-        page: A single page object from a PdfReader representing the generated overlay.
-    """
-    width_mm = _points_to_mm(width_points)
-    height_mm = _points_to_mm(height_points)
-    orientation = "L" if width_mm > height_mm else "P"
-    pdf = FPDF(orientation=orientation, unit="mm", format=(width_mm, height_mm))
-    pdf.set_margins(0, 0, 0)
-    pdf.set_auto_page_break(auto=False)
-    pdf.add_page()
-    draw_fn(pdf, width_mm, height_mm)
-    pdf_output = pdf.output()
-    if isinstance(pdf_output, str):
-        pdf_bytes = pdf_output.encode("latin-1")
+    if font_path:
+        font = _fitz_font(str(font_path))
+        font_kwargs = {"fontname": "DejaVuSans", "fontfile": str(font_path)}
     else:
-        pdf_bytes = bytes(pdf_output)
-    overlay_reader = PdfReader(BytesIO(pdf_bytes))
-    return overlay_reader.pages[0]
+        font = _fitz_font(None)
+        font_kwargs = {"fontname": "helv"}
+    width = font.text_length(text, fontsize=font_size)
+    # Shift the baseline down by about half the cap height so the glyphs sit on `center`.
+    origin = fitz.Point(center.x - width / 2, center.y + font_size * 0.35)
+    page.insert_text(
+        origin,
+        text,
+        fontsize=font_size,
+        color=(gray, gray, gray),
+        morph=(center, fitz.Matrix(angle)) if angle else None,
+        **font_kwargs,
+    )
 
 
-def _merge_overlay_page(
-    page: Any,
-    overlay: Any,
-    box: Any,
-) -> None:
+def _unrotated_rect(page: fitz.Page) -> fitz.Rect:
+    """Return the visible area in the coordinates MuPDF's insert methods use, ignoring /Rotate."""
+    cropbox = page.cropbox
+    return fitz.Rect(0, 0, cropbox.width, cropbox.height)
+
+
+@lru_cache(maxsize=4)
+def _fitz_font(font_path: str | None) -> fitz.Font:
+    """Load an overlay font once per process for text measurement."""
+    return fitz.Font(fontfile=font_path) if font_path else fitz.Font("helv")
+
+
+def _save_overlaid(document: fitz.Document, output_path: Path, font_path: Path | None) -> None:
     """
-    Merge an overlay page onto a target PDF page, honoring crop box offsets when present.
-    
-    If the crop box origin is not at (0, 0), translates the overlay so it aligns with the visible page region.
-    Falls back to a direct merge if transformed merge is unavailable.
+    Save a document after overlay text was inserted.
+
+    An embedded Unicode font is subset first; MuPDF would otherwise store the whole file.
     """
-    try:
-        lower_left = box.lower_left
-        tx = float(lower_left[0])
-        ty = float(lower_left[1])
-    except Exception:
-        tx = 0.0
-        ty = 0.0
-
-    if (tx or ty) and hasattr(page, "merge_transformed_page"):
-        page.merge_transformed_page(overlay, Transformation().translate(tx, ty))
-    else:
-        page.merge_page(overlay)
+    if font_path:
+        document.subset_fonts()
+    document.save(str(output_path), garbage=1, deflate=True)
 
 
 def merge_pdfs(inputs: Sequence[Path], output_path: Path) -> Path:
     """
     Merge multiple PDF files into a single PDF.
     
+    Uses a single qpdf pass when qpdf is installed and falls back to pypdf otherwise.
+    The fallback parses each distinct input once, even if it is listed repeatedly.
+    
     Parameters:
         inputs (Sequence[Path]): Paths to source PDF files, merged in the given order.
         output_path (Path): Destination path for the merged PDF.
@@ -251,25 +384,56 @@ def merge_pdfs(inputs: Sequence[Path], output_path: Path) -> Path:
     Returns:
         Path: The path to the written merged PDF (same as `output_path`).
     """
-    writer = PdfWriter()
+    page_args: List[str] = []
     for path in inputs:
-        reader = PdfReader(str(path))
-        for page in reader.pages:
-            writer.add_page(page)
-    with output_path.open("wb") as handle:
-        writer.write(handle)
+        page_args.extend([str(path), "1-z"])
+    overwrites_input = output_path.resolve() in {Path(path).resolve() for path in inputs}
+    if (
+        page_args
+        and not overwrites_input
+        and _run_qpdf(["--empty", "--pages", *page_args, "--", str(output_path)])
+    ):
+        return output_path
+
+    writer = PdfWriter()
+    readers: dict[Path, PdfReader] = {}
+    with ExitStack() as stack:
+        for path in inputs:
+            reader = readers.get(path)
+            if reader is None:
+                source = nullcontext(str(path)) if overwrites_input else _mapped_pdf(path)
+                reader = readers[path] = PdfReader(stack.enter_context(source))
+            writer.append(reader, import_outline=False)
+        with output_path.open("wb", buffering=WRITE_BUFFER_BYTES) as handle:
+            writer.write(handle)
     return output_path
 
 
+def _split_parallelism() -> int:
+    """Return the number of concurrent qpdf range extractions for split_pdf."""
+    value = os.getenv("ZENPDF_SPLIT_PARALLELISM")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            pass
+    return min(8, os.cpu_count() or 1)
+
+
 def split_pdf(
     input_path: Path,
     output_dir: Path,
     ranges: str | None,
 ) -> List[Path]:
-    """Split a PDF into multiple files based on ranges."""
+    """
+    Split a PDF into multiple files based on ranges.
+
+    Explicit ranges are extracted with qpdf when it is installed, running up to
+    `ZENPDF_SPLIT_PARALLELISM` extractions at once; the default one-file-per-page
+    split stays on pypdf so the source is parsed only once.
+    """
     reader = PdfReader(str(input_path))
     total_pages = len(reader.pages)
-    output_files: List[Path] = []
 
     if ranges:
         page_ranges = _parse_ranges(ranges, total_pages)
@@ -278,15 +442,31 @@ def split_pdf(
     else:
         page_ranges = [(index, index) for index in range(1, total_pages + 1)]
 
-    for index, (start, end) in enumerate(page_ranges, start=1):
+    targets = [
+        (output_dir / f"split_{index}.pdf", start, end)
+        for index, (start, end) in enumerate(page_ranges, start=1)
+    ]
+
+    def _extract(target: Tuple[Path, int, int]) -> bool:
+        output_path, start, end = target
+        return _run_qpdf(
+            ["--empty", "--pages", str(input_path), f"{start}-{end}", "--", str(output_path)]
+        )
+
+    extracted = [False] * len(targets)
+    if ranges and _tool_path("qpdf"):
+        workers = min(_split_parallelism(), len(targets))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            extracted = list(executor.map(_extract, targets))
+
+    for (output_path, start, end), done in zip(targets, extracted):
+        if done:
+            continue
         writer = PdfWriter()
-        for page_number in range(start - 1, end):
-            writer.add_page(reader.pages[page_number])
-        output_path = output_dir / f"split_{index}.pdf"
-        with output_path.open("wb") as handle:
+        writer.append(reader, pages=(start - 1, end), import_outline=False)
+        with output_path.open("wb", buffering=WRITE_BUFFER_BYTES) as handle:
             writer.write(handle)
-        output_files.append(output_path)
-    return output_files
+    return [output_path for output_path, _start, _end in targets]
 
 
 def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
@@ -296,7 +476,8 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
     warnings: list[str] = []
     steps: list[dict] = []
     candidates: list[dict] = []
-    run_id = uuid.uuid4().hex[:8]
+    candidate_digests: set[tuple[int, bytes]] = set()
+    run_id = _run_id()
 
     def _env_int(name: str, default: int) -> int:
         value = os.environ.get(name)
@@ -329,20 +510,21 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
     def _run_cmd(cmd: list[str], timeout_s: int, env: dict | None = None) -> dict:
         start = time.perf_counter()
         try:
+            # Nothing reads stdout, and step notes only keep the head of stderr.
             result = subprocess.run(
                 cmd,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 check=False,
                 timeout=timeout_s,
                 env=env,
             )
             elapsed_ms = int((time.perf_counter() - start) * 1000)
+            stderr = (result.stderr or b"")[:4096].decode("utf-8", errors="replace")
             return {
                 "ok": result.returncode == 0,
                 "returncode": result.returncode,
-                "stdout": (result.stdout or "").strip(),
-                "stderr": (result.stderr or "").strip(),
+                "stderr": stderr.strip(),
                 "timeout": False,
                 "ms": elapsed_ms,
             }
@@ -351,7 +533,6 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
             return {
                 "ok": False,
                 "returncode": None,
-                "stdout": "",
                 "stderr": "",
                 "timeout": True,
                 "ms": elapsed_ms,
@@ -382,6 +563,11 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
             reader = PdfReader(str(path))
             if reader.is_encrypted:
                 raise ValueError("PDF is encrypted")
+            # The page-tree root's /Count needs no page objects; len(reader.pages) resolves
+            # all of them, which is quadratic when they share one large object stream.
+            count = reader.root_object["/Pages"].get("/Count")
+            if isinstance(count, int) and count > 0:
+                return count
             return max(1, len(reader.pages))
         except ValueError:
             raise
@@ -395,26 +581,49 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
         except Exception:
             return 1
 
-    def _validate_candidate(path: Path, expected_pages: int) -> bool:
-        if not path.exists() or path.stat().st_size == 0:
+    def _validate_candidate(
+        path: Path,
+        expected_pages: int,
+        document: fitz.Document | None = None,
+    ) -> bool:
+        try:
+            if path.stat().st_size == 0:
+                return False
+        except OSError:
             return False
-        if shutil.which("qpdf"):
-            result = _run_cmd(["qpdf", "--check", str(path)], timeout_s=20)
+        if qpdf:  # resolved once per call below, before the first validation
+            result = _run_cmd([qpdf, "--check", str(path)], timeout_s=20)
             if not result["ok"]:
                 return False
         try:
-            with fitz.open(str(path)) as document:
-                if document.page_count != expected_pages:
+            with nullcontext(document) if document is not None else fitz.open(str(path)) as doc:
+                if doc.page_count != expected_pages:
                     return False
-                if document.page_count > 0:
-                    page = document.load_page(0)
+                if doc.page_count > 0:
+                    page = doc.load_page(0)
                     _ = page.get_pixmap(matrix=fitz.Matrix(0.5, 0.5))
         except Exception:
             return False
         return True
 
-    def _add_candidate(path: Path, method: str, label: str, expected_pages: int) -> bool:
-        if not _validate_candidate(path, expected_pages):
+    def _add_candidate(
+        path: Path,
+        method: str,
+        label: str,
+        expected_pages: int,
+        document: fitz.Document | None = None,
+    ) -> bool:
+        # Tools often converge on identical bytes (e.g. qpdf on already optimal input);
+        # a copy of an accepted candidate needs neither validation nor a second entry.
+        try:
+            with path.open("rb") as handle:
+                size = os.fstat(handle.fileno()).st_size
+                digest = (size, hashlib.file_digest(handle, "blake2b").digest())
+        except OSError:
+            digest = None
+        if digest in candidate_digests:
+            return True
+        if not _validate_candidate(path, expected_pages, document):
             warnings.append(f"{label} output invalid")
             return False
         candidates.append(
@@ -425,6 +634,7 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
                 "size": path.stat().st_size,
             }
         )
+        candidate_digests.add(digest)
         return True
 
     def _rewrite_pdf(source: Path, target: Path) -> bool:
@@ -433,17 +643,14 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
             if reader.is_encrypted:
                 raise ValueError("PDF is encrypted")
             writer = PdfWriter()
-            for page in reader.pages:
-                writer.add_page(page)
+            writer.append(reader, import_outline=False)
             compress = getattr(writer, "compress_content_streams", None)
             if callable(compress):
                 compress()
             raw_metadata = reader.metadata or {}
-            safe_metadata = {}
-            for key, value in raw_metadata.items():
-                if value is None:
-                    continue
-                safe_metadata[str(key)] = str(value)
+            safe_metadata = {
+                str(key): str(value) for key, value in raw_metadata.items() if value is not None
+            }
             if safe_metadata:
                 writer.add_metadata(safe_metadata)
             with target.open("wb") as handle:
@@ -453,7 +660,7 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
             warnings.append(f"pypdf rewrite failed: {error}")
             return False
 
-    def _detect_image_heavy(path: Path) -> dict:
+    def _detect_image_heavy(document: fitz.Document | None) -> dict:
         metrics = {
             "pages": 0,
             "sampled_pages": 0,
@@ -461,45 +668,45 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
             "text_chars": 0,
             "image_heavy": False,
         }
+        if document is None:
+            return metrics
         try:
-            with fitz.open(str(path)) as document:
-                pages = document.page_count
-                metrics["pages"] = pages
-                if pages == 0:
-                    return metrics
-                sample_pages = min(pages, 10)
-                step = max(1, pages // sample_pages)
-                sampled = 0
-                image_count = 0
-                text_chars = 0
-                for index in range(0, pages, step):
-                    if sampled >= sample_pages:
-                        break
-                    page = document.load_page(index)
-                    image_count += len(page.get_images(full=True))
-                    text_chars += len(page.get_text("text") or "")
-                    sampled += 1
-                metrics["sampled_pages"] = sampled
-                if sampled > 0:
-                    images_per_page = image_count / sampled
-                    text_per_page = text_chars / sampled
-                else:
-                    images_per_page = 0
-                    text_per_page = 0
-                metrics["image_count"] = int(round(images_per_page * pages))
-                metrics["text_chars"] = int(round(text_per_page * pages))
-                metrics["images_per_page"] = images_per_page
-                metrics["text_chars_per_page"] = text_per_page
-                image_heavy = metrics["image_count"] >= pages * 1.0 or (
-                    (text_per_page < 500) and (images_per_page > 0.5)
-                )
-                metrics["image_heavy"] = image_heavy
+            pages = document.page_count
+            metrics["pages"] = pages
+            if pages == 0:
+                return metrics
+            sample_pages = min(pages, 10)
+            step = max(1, pages // sample_pages)
+            sampled = 0
+            image_count = 0
+            text_chars = 0
+            for page in document.pages(0, min(pages, step * sample_pages), step):
+                image_count += len(page.get_images(full=False))
+                text_chars += len(page.get_text("text") or "")
+                sampled += 1
+            metrics["sampled_pages"] = sampled
+            if sampled > 0:
+                images_per_page = image_count / sampled
+                text_per_page = text_chars / sampled
+            else:
+                images_per_page = 0
+                text_per_page = 0
+            metrics["image_count"] = int(round(images_per_page * pages))
+            metrics["text_chars"] = int(round(text_per_page * pages))
+            metrics["images_per_page"] = images_per_page
+            metrics["text_chars_per_page"] = text_per_page
+            image_heavy = metrics["image_count"] >= pages * 1.0 or (
+                (text_per_page < 500) and (images_per_page > 0.5)
+            )
+            metrics["image_heavy"] = image_heavy
         except Exception as error:
             warnings.append(f"image-heavy detector failed: {error}")
         return metrics
 
+    tmp_prefix = str(output_path.parent / f"{input_path.stem}_{run_id}_")
+
     def _tmp_path(name: str) -> Path:
-        return output_path.parent / f"{input_path.stem}_{run_id}_{name}"
+        return Path(tmp_prefix + name)
 
     try:
         _load_pdf(input_path, allow_encrypted=False)
@@ -510,6 +717,8 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
     except Exception as error:  # noqa: BLE001
         warnings.append(f"preflight read failed: {error}")
 
+    expected_pages = _safe_page_count(input_path)
+
     timeout_override = _env_int("ZENPDF_COMPRESS_TIMEOUT_SECONDS", 0)
     if timeout_override > 0:
         timeout_seconds = timeout_override
@@ -518,13 +727,12 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
         per_mb_timeout = _env_int("ZENPDF_COMPRESS_TIMEOUT_PER_MB_SECONDS", 3)
         per_page_timeout = _env_float("ZENPDF_COMPRESS_TIMEOUT_PER_PAGE_SECONDS", 1.5)
         max_timeout = _env_int("ZENPDF_COMPRESS_TIMEOUT_MAX_SECONDS", 900)
-        pages_for_timeout = _safe_page_count(input_path)
         timeout_seconds = min(
             max_timeout,
-            int(base_timeout + (size_mb * per_mb_timeout) + (pages_for_timeout * per_page_timeout)),
+            int(base_timeout + (size_mb * per_mb_timeout) + (expected_pages * per_page_timeout)),
         )
 
-    probe_pages = max(1, min(_safe_page_count(input_path), _env_int("ZENPDF_COMPRESS_TIMEOUT_PROBE_PAGES", 5)))
+    probe_pages = max(1, min(expected_pages, _env_int("ZENPDF_COMPRESS_TIMEOUT_PROBE_PAGES", 5)))
     probe_timeout = min(
         _env_int("ZENPDF_COMPRESS_TIMEOUT_PROBE_MAX_SECONDS", 30),
         max(10, int(timeout_seconds * 0.25)),
@@ -537,11 +745,15 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
     auto_image_heavy = _env_bool("ZENPDF_COMPRESS_AUTO_IMAGE_HEAVY", True)
     pass_through_env = _env_bool("ZENPDF_COMPRESS_GS_PASSTHROUGH_JPEG", False)
     use_zopfli = _env_bool("ZENPDF_COMPRESS_USE_ZOPFLI", False)
+    zopfli_skip_savings = _env_float("ZENPDF_COMPRESS_ZOPFLI_SKIP_SAVINGS_PCT", 0.7)
     enable_image_opt = _env_bool("ZENPDF_COMPRESS_ENABLE_IMAGE_OPT", False)
     enable_pdfsizeopt = _env_bool("ZENPDF_COMPRESS_ENABLE_PDFSIZEOPT", False)
     enable_jbig2 = _env_bool("ZENPDF_COMPRESS_ENABLE_JBIG2", False)
     qpdf_keep_inline = _env_bool("ZENPDF_QPDF_OI_KEEP_INLINE_IMAGES", False)
     gs_min_size_mb = _env_int("ZENPDF_COMPRESS_GS_MIN_SIZE_MB", 5)
+    gs_probe_skip_size_mb = _env_int("ZENPDF_COMPRESS_GS_PROBE_SKIP_SIZE_MB", 20)
+    gs_probe_skip_pages = _env_int("ZENPDF_COMPRESS_GS_PROBE_SKIP_PAGES", 10)
+    gs_probe_skip_size_max_pages = _env_int("ZENPDF_COMPRESS_GS_PROBE_SKIP_SIZE_MAX_PAGES", 200)
     gs_preset = _env_str("ZENPDF_COMPRESS_GS_PRESET", "").lower()
     gs_extra_flags = _env_bool("ZENPDF_COMPRESS_GS_EXTRA_FLAGS", False)
     mutool_object_streams = _env_bool("ZENPDF_MUTOOL_OBJECT_STREAMS", False)
@@ -569,18 +781,25 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
             savings_threshold = 0.08
     min_savings_bytes = _env_int("ZENPDF_COMPRESS_MIN_SAVINGS_BYTES", 200000)
 
-    expected_pages = _safe_page_count(input_path)
-    image_metrics = _detect_image_heavy(input_path)
-    image_heavy = auto_image_heavy and image_metrics.get("image_heavy", False)
-
-    mutool = shutil.which("mutool")
-    qpdf = shutil.which("qpdf")
-    ghostscript = shutil.which("gs")
-    pdfsizeopt = shutil.which("pdfsizeopt")
-    jbig2 = shutil.which("jbig2")
+    mutool = _tool_path("mutool")
+    qpdf = _tool_path("qpdf")
+    ghostscript = _tool_path("gs")
+    pdfsizeopt = _tool_path("pdfsizeopt")
+    jbig2 = _tool_path("jbig2")
 
-    if _validate_candidate(input_path, expected_pages):
-        _add_candidate(input_path, "original", "original", expected_pages)
+    # The detector and the original's validation share one parse of the input.
+    try:
+        input_document = fitz.open(str(input_path))
+    except Exception as error:  # noqa: BLE001
+        input_document = None
+        warnings.append(f"image-heavy detector failed: {error}")
+    try:
+        image_metrics = _detect_image_heavy(input_document)
+        _add_candidate(input_path, "original", "original", expected_pages, input_document)
+    finally:
+        if input_document is not None:
+            input_document.close()
+    image_heavy = auto_image_heavy and image_metrics.get("image_heavy", False)
 
     normalized_path = input_path
     base_path = input_path
@@ -661,25 +880,6 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
     else:
         _record_step("optimize_qpdf", None, "skipped: qpdf not available")
 
-    if mutool:
-        mutool_opt_path = _tmp_path("mutool_opt.pdf")
-        cmd = [
-            "mutool",
-            "merge",
-            "-o",
-            str(mutool_opt_path),
-            "-O",
-            "compress",
-            str(base_path),
-        ]
-        result = _run_cmd(cmd, timeout_seconds)
-        _record_step("optimize_mutool", result)
-        temp_paths.append(mutool_opt_path)
-        if result["ok"]:
-            _add_candidate(mutool_opt_path, "mutool", "mutool_opt", expected_pages)
-    else:
-        _record_step("optimize_mutool", None, "skipped: mutool not available")
-
     def _ghostscript_settings(override_preset: str | None = None) -> tuple[str, str, str]:
         preset = override_preset or ("screen" if profile == "strong" else "ebook")
         if preset == "screen":
@@ -690,7 +890,11 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
         if not ghostscript:
             return {"ok": False, "stderr": "ghostscript missing", "timeout": False, "ms": 0}
         pdfsettings, color_res, gray_res = _ghostscript_settings(preset)
-        pass_through = pass_through_env or profile == "light"
+        # This early pass only runs on image-heavy input. Outside the strong profile, JPEG
+        # and JPX images that need no downsampling are copied as-is instead of being
+        # decoded and re-encoded; images above the target resolution are still resampled.
+        pass_through = pass_through_env or profile != "strong"
+        pass_through_flag = "true" if pass_through else "false"
         cmd = [
             ghostscript,
             "-dSAFER",
@@ -699,7 +903,8 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
             "-sDEVICE=pdfwrite",
             "-dCompatibilityLevel=1.5",
             f"-dPDFSETTINGS={pdfsettings}",
-            f"-dPassThroughJPEGImages={'true' if pass_through else 'false'}",
+            f"-dPassThroughJPEGImages={pass_through_flag}",
+            f"-dPassThroughJPXImages={pass_through_flag}",
             "-dDownsampleColorImages=true",
             f"-dColorImageResolution={color_res}",
             "-dColorImageDownsampleType=/Bicubic",
@@ -720,14 +925,29 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
         _record_step(label, result)
         return result
 
-    if image_heavy and ghostscript and size_mb >= gs_min_size_mb:
+    def _current_best_savings() -> tuple[int, float]:
+        if not candidates or size_bytes == 0:
+            return 0, 0.0
+        best = min(candidates, key=lambda item: item["size"])
+        savings = max(size_bytes - best["size"], 0)
+        return savings, savings / size_bytes
+
+    def _should_run_heavy_steps() -> bool:
+        savings_bytes, savings_pct = _current_best_savings()
+        return savings_bytes < min_savings_bytes or savings_pct < savings_threshold
+
+    if image_heavy and ghostscript and size_mb >= gs_min_size_mb and not _should_run_heavy_steps():
+        _record_step("ghostscript_early", None, "skipped: already reduced")
+    elif image_heavy and ghostscript and size_mb >= gs_min_size_mb:
         gs_output = _tmp_path("gs_early.pdf")
         temp_paths.append(gs_output)
         preset_override = "screen" if profile == "strong" else "ebook"
         result = _run_gs_basic(normalized_path, gs_output, "ghostscript_early", preset_override)
         if result["ok"]:
             _add_candidate(gs_output, "ghostscript", "ghostscript_early", expected_pages)
-            if qpdf:
+            if qpdf and not _should_run_heavy_steps():
+                _record_step("qpdf_after_gs", None, "skipped: already reduced")
+            elif qpdf:
                 qpdf_after_gs = _tmp_path("gs_qpdf.pdf")
                 temp_paths.append(qpdf_after_gs)
                 result = _run_cmd(
@@ -747,20 +967,34 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
                 if result["ok"]:
                     _add_candidate(qpdf_after_gs, "qpdf_after_gs", "qpdf_after_gs", expected_pages)
 
-    def _current_best_savings() -> tuple[int, float]:
-        if not candidates or size_bytes == 0:
-            return 0, 0.0
-        best = min(candidates, key=lambda item: item["size"])
-        savings = max(size_bytes - best["size"], 0)
-        return savings, savings / size_bytes
-
-    def _should_run_heavy_steps() -> bool:
-        savings_bytes, savings_pct = _current_best_savings()
-        return savings_bytes < min_savings_bytes or savings_pct < savings_threshold
-
     def _empty_outcome() -> dict:
         return {"steps": [], "candidates": [], "temp_paths": [], "warnings": []}
 
+    def _run_mutool_opt_task() -> dict:
+        outcome = _empty_outcome()
+        if not mutool:
+            outcome["steps"].append(_make_step_entry("optimize_mutool", None, "skipped: mutool not available"))
+            return outcome
+        if not _should_run_heavy_steps():
+            outcome["steps"].append(_make_step_entry("optimize_mutool", None, "skipped: already reduced"))
+            return outcome
+        mutool_opt_path = _tmp_path("mutool_opt.pdf")
+        outcome["temp_paths"].append(mutool_opt_path)
+        cmd = [
+            "mutool",
+            "merge",
+            "-o",
+            str(mutool_opt_path),
+            "-O",
+            "compress",
+            str(base_path),
+        ]
+        result = _run_cmd(cmd, timeout_seconds)
+        outcome["steps"].append(_make_step_entry("optimize_mutool", result))
+        if result["ok"]:
+            outcome["candidates"].append((mutool_opt_path, "mutool", "mutool_opt"))
+        return outcome
+
     def _run_image_opt_task() -> dict:
         outcome = _empty_outcome()
         if not enable_image_opt:
@@ -768,6 +1002,9 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
         if not qpdf:
             outcome["steps"].append(_make_step_entry("optimize_images_qpdf", None, "skipped: qpdf not available"))
             return outcome
+        if not _should_run_heavy_steps():
+            outcome["steps"].append(_make_step_entry("optimize_images_qpdf", None, "skipped: already reduced"))
+            return outcome
         image_opt_path = _tmp_path("image_opt.pdf")
         outcome["temp_paths"].append(image_opt_path)
         cmd = [
@@ -794,7 +1031,7 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
             outcome["candidates"].append((image_opt_path, "qpdf_optimize_images", "image_opt"))
         return outcome
 
-    def _run_pdfsizeopt_task(should_run: bool) -> dict:
+    def _run_pdfsizeopt_task() -> dict:
         outcome = _empty_outcome()
         if not (enable_pdfsizeopt or enable_jbig2):
             return outcome
@@ -804,7 +1041,7 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
         if not pdfsizeopt:
             outcome["steps"].append(_make_step_entry("optimize_pdfsizeopt", None, "skipped: pdfsizeopt not available"))
             return outcome
-        if not should_run:
+        if not _should_run_heavy_steps():
             outcome["steps"].append(_make_step_entry("optimize_pdfsizeopt", None, "skipped: already reduced"))
             return outcome
         pdfsizeopt_path = _tmp_path("pdfsizeopt.pdf")
@@ -822,7 +1059,7 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
             outcome["candidates"].append((pdfsizeopt_path, method, "pdfsizeopt"))
         return outcome
 
-    def _run_ghostscript_task(should_run: bool) -> dict:
+    def _run_ghostscript_task() -> dict:
         outcome = _empty_outcome()
         if image_heavy:
             outcome["steps"].append(_make_step_entry("ghostscript_full", None, "skipped: image-heavy handled"))
@@ -833,7 +1070,7 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
         if size_mb < gs_min_size_mb:
             outcome["steps"].append(_make_step_entry("ghostscript_full", None, "skipped: below size threshold"))
             return outcome
-        if not should_run:
+        if not _should_run_heavy_steps():
             outcome["steps"].append(_make_step_entry("ghostscript_full", None, "skipped: already reduced"))
             return outcome
 
@@ -887,18 +1124,33 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
         gs_output = _tmp_path("gs.pdf")
         outcome["temp_paths"].extend([probe_output, gs_output])
 
-        probe_result = _run_cmd(
-            _gs_cmd(gs_input_path, probe_output, 1, probe_pages),
-            probe_timeout,
+        # A probe only pays off when the full run could plausibly outlast the timeout;
+        # on short documents it is nearly as costly as the run itself. Run time grows
+        # with page count, so a small file only skips it when it is not long either.
+        short_document = expected_pages <= max(probe_pages, gs_probe_skip_pages)
+        small_document = (
+            size_mb < gs_probe_skip_size_mb and expected_pages <= gs_probe_skip_size_max_pages
         )
-        probe_ok = probe_result["ok"]
-        probe_notes = None
-        if probe_ok and probe_pages > 0:
-            estimated_ms = int((probe_result["ms"] / probe_pages) * expected_pages)
-            if estimated_ms > timeout_seconds * 1000:
-                probe_ok = False
-                probe_notes = "probe too slow, skipping full run"
-        outcome["steps"].append(_make_step_entry("ghostscript_probe", probe_result, probe_notes))
+        if short_document or small_document:
+            probe_ok = True
+            outcome["steps"].append(
+                _make_step_entry("ghostscript_probe", None, "skipped: small document")
+            )
+        else:
+            probe_result = _run_cmd(
+                _gs_cmd(gs_input_path, probe_output, 1, probe_pages),
+                probe_timeout,
+            )
+            probe_ok = probe_result["ok"]
+            probe_notes = None
+            if probe_ok and probe_pages > 0:
+                estimated_ms = int((probe_result["ms"] / probe_pages) * expected_pages)
+                if estimated_ms > timeout_seconds * 1000:
+                    probe_ok = False
+                    probe_notes = "probe too slow, skipping full run"
+            outcome["steps"].append(
+                _make_step_entry("ghostscript_probe", probe_result, probe_notes)
+            )
         if probe_ok:
             full_result = _run_cmd(_gs_cmd(gs_input_path, gs_output), timeout_seconds)
             outcome["steps"].append(_make_step_entry("ghostscript_full", full_result))
@@ -913,15 +1165,25 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
             outcome["steps"].append(_make_step_entry("ghostscript_full", None, "skipped: probe failed"))
         return outcome
 
-    should_run_heavy = _should_run_heavy_steps()
+    def _merge_outcome(outcome: dict) -> None:
+        steps.extend(outcome.get("steps", []))
+        for warning in outcome.get("warnings", []):
+            warnings.append(warning)
+        for path, method, label in outcome.get("candidates", []):
+            _add_candidate(path, method, label, expected_pages)
+        temp_paths.extend(outcome.get("temp_paths", []))
 
     task_specs: list[tuple[str, Callable[[], dict]]] = []
+    # mutool's rewrite does not feed later steps, so it can join the fan-out. Tasks check
+    # the savings goal when they start: run serially, each sees the earlier candidates;
+    # run in parallel, they all see the candidates from before the fan-out.
+    task_specs.append(("mutool_opt", _run_mutool_opt_task))
     if enable_image_opt:
         task_specs.append(("image_opt", _run_image_opt_task))
     if enable_pdfsizeopt or enable_jbig2:
-        task_specs.append(("pdfsizeopt", lambda: _run_pdfsizeopt_task(should_run_heavy)))
+        task_specs.append(("pdfsizeopt", _run_pdfsizeopt_task))
     if ghostscript:
-        task_specs.append(("ghostscript", lambda: _run_ghostscript_task(should_run_heavy)))
+        task_specs.append(("ghostscript", _run_ghostscript_task))
 
     task_results: dict[str, dict] = {}
     if parallelism > 1 and len(task_specs) > 1:
@@ -943,20 +1205,24 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
                         "temp_paths": [],
                         "warnings": [f"{name} failed: {error}"],
                     }
+        for name, _ in task_specs:
+            _merge_outcome(task_results.get(name, _empty_outcome()))
     else:
-        for name, task in task_specs:
-            task_results[name] = task()
+        for _, task in task_specs:
+            _merge_outcome(task())
 
-    for name, _ in task_specs:
-        outcome = task_results.get(name, _empty_outcome())
-        steps.extend(outcome.get("steps", []))
-        for warning in outcome.get("warnings", []):
-            warnings.append(warning)
-        for path, method, label in outcome.get("candidates", []):
-            _add_candidate(path, method, label, expected_pages)
-        temp_paths.extend(outcome.get("temp_paths", []))
+    def _remove_temp_paths() -> None:
+        for path in temp_paths:
+            if path in {input_path, output_path}:
+                continue
+            try:
+                if path.exists():
+                    path.unlink()
+            except OSError:
+                pass
 
     if not candidates:
+        _remove_temp_paths()
         raise ValueError(
             "Could not compress this PDF due to malformed structure; try Repair PDF first."
         )
@@ -977,17 +1243,21 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
 
     final_path = best["path"]
     if final_path != output_path:
+        if output_path.exists():
+            output_path.unlink()
         if final_path == input_path:
-            shutil.copy2(final_path, output_path)
+            # Later passes only ever rename over output_path, so sharing the input's
+            # inode is safe and skips copying the whole file.
+            try:
+                os.link(final_path, output_path)
+            except OSError:
+                shutil.copy2(final_path, output_path)
         else:
-            if output_path.exists():
-                output_path.unlink()
             final_path.replace(output_path)
         final_path = output_path
 
-    if qpdf:
-        deterministic_out = _tmp_path("deterministic.pdf")
-        result = _run_cmd(
+    def _run_final_qpdf(target: Path, timeout_s: int, env: dict | None) -> dict:
+        return _run_cmd(
             [
                 "qpdf",
                 "--object-streams=generate",
@@ -996,57 +1266,62 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
                 "--compression-level=9",
                 "--deterministic-id",
                 str(final_path),
-                str(deterministic_out),
+                str(target),
             ],
-            min(timeout_seconds, 120),
+            timeout_s,
+            env=env,
         )
-        _record_step("deterministic_id", result)
-        temp_paths.append(deterministic_out)
-        if result["ok"] and _validate_candidate(deterministic_out, expected_pages):
-            if output_path.exists():
-                output_path.unlink()
-            deterministic_out.replace(output_path)
-            final_path = output_path
 
-    if use_zopfli and qpdf:
-        zopfli_out = _tmp_path("zopfli.pdf")
-        env = os.environ.copy()
-        env["QPDF_ZOPFLI"] = "enabled"
-        result = _run_cmd(
-            [
-                "qpdf",
-                "--object-streams=generate",
-                "--compress-streams=y",
-                "--recompress-flate",
-                "--compression-level=9",
-                "--deterministic-id",
-                str(final_path),
-                str(zopfli_out),
-            ],
-            timeout_seconds,
-            env=env,
+    final_passes: list[tuple[str, Path, int, dict | None]] = []
+    if qpdf:
+        final_passes.append(
+            ("deterministic_id", _tmp_path("deterministic.pdf"), min(timeout_seconds, 120), None)
         )
-        _record_step("qpdf_zopfli", result)
-        temp_paths.append(zopfli_out)
-        if result["ok"] and _validate_candidate(zopfli_out, expected_pages):
-            zopfli_size = zopfli_out.stat().st_size
-            zopfli_savings = max(size_bytes - zopfli_size, 0)
-            if zopfli_savings >= min_savings_bytes and (
-                zopfli_savings / size_bytes
-            ) >= savings_threshold:
-                if output_path.exists():
-                    output_path.unlink()
-                zopfli_out.replace(output_path)
-                final_path = output_path
-
-    for path in temp_paths:
-        if path in {input_path, output_path}:
+    if use_zopfli and qpdf:
+        # Zopfli re-encodes every stream for a few more percent; not worth it once the
+        # chosen output is already a fraction of the original.
+        if savings_pct >= zopfli_skip_savings:
+            _record_step("qpdf_zopfli", None, "skipped: savings already sufficient")
+        else:
+            env = os.environ.copy()
+            env["QPDF_ZOPFLI"] = "enabled"
+            final_passes.append(("qpdf_zopfli", _tmp_path("zopfli.pdf"), timeout_seconds, env))
+    temp_paths.extend(target for _, target, _, _ in final_passes)
+
+    # Both passes read the chosen output (zopfli's flags are a superset of the
+    # deterministic pass), so they can run side by side; zopfli still wins when it
+    # clears the savings threshold.
+    if parallelism > 1 and len(final_passes) > 1:
+        with ThreadPoolExecutor(max_workers=len(final_passes)) as executor:
+            final_results = list(
+                executor.map(lambda spec: _run_final_qpdf(*spec[1:]), final_passes)
+            )
+    else:
+        final_results = [_run_final_qpdf(*spec[1:]) for spec in final_passes]
+
+    final_winner: Path | None = None
+    for (name, target, _, _), result in zip(final_passes, final_results):
+        _record_step(name, result)
+        if not (result["ok"] and _validate_candidate(target, expected_pages)):
             continue
-        try:
-            if path.exists():
-                path.unlink()
-        except OSError:
-            pass
+        if name == "qpdf_zopfli":
+            zopfli_bytes = target.stat().st_size
+            zopfli_savings = max(size_bytes - zopfli_bytes, 0)
+            if zopfli_savings < min_savings_bytes or (
+                zopfli_savings / size_bytes
+            ) < savings_threshold:
+                continue
+            if final_winner is not None and zopfli_bytes >= final_winner.stat().st_size:
+                continue
+        final_winner = target
+    # A single rename at the end, rather than one per accepted pass.
+    if final_winner is not None:
+        if output_path.exists():
+            output_path.unlink()
+        final_winner.replace(output_path)
+        final_path = output_path
+
+    _remove_temp_paths()
 
     output_bytes = final_path.stat().st_size
     savings_bytes = max(size_bytes - output_bytes, 0)
@@ -1079,16 +1354,32 @@ def compress_pdf(input_path: Path, output_path: Path) -> tuple[Path, dict]:
     return final_path, result_payload
 
 def repair_pdf(input_path: Path, output_path: Path) -> Path:
-    """Rewrite a PDF to rebuild its internal structure."""
-    reader = PdfReader(str(input_path))
-    if reader.is_encrypted:
+    """
+    Rewrite a PDF to rebuild its internal structure.
+
+    qpdf's recovering parser and writer do this natively when installed; pypdf is the fallback.
+    """
+    overwrites_input = output_path.resolve() == input_path.resolve()
+    try:
+        encrypted = _has_encrypt_dictionary(input_path)
+    except ValueError:
+        encrypted = False  # too damaged for MuPDF's xref scan; qpdf may still recover it
+    if encrypted:
         raise ValueError("PDF is encrypted")
-    writer = PdfWriter()
-    for page in reader.pages:
-        writer.add_page(page)
-    writer.add_metadata(reader.metadata or {})
-    with output_path.open("wb") as handle:
-        writer.write(handle)
+    qpdf_target = ["--replace-input"] if overwrites_input else [str(output_path)]
+    if _run_qpdf([str(input_path), *qpdf_target]):
+        return output_path
+    source = nullcontext(str(input_path)) if overwrites_input else _mapped_pdf(input_path)
+    with source as stream:
+        reader = PdfReader(stream)
+        if reader.is_encrypted:
+            raise ValueError("PDF is encrypted")
+        writer = PdfWriter()
+        for page in reader.pages:
+            writer.add_page(page)
+        writer.add_metadata(reader.metadata or {})
+        with output_path.open("wb") as handle:
+            writer.write(handle)
     return output_path
 
 
@@ -1100,14 +1391,18 @@ def rotate_pdf(
 ) -> Path:
     """Rotate selected pages by the provided angle."""
     reader = _load_pdf(input_path)
-    writer = PdfWriter()
     total_pages = len(reader.pages)
     target_pages = _resolve_page_selection(pages, total_pages)
-    for index, page in enumerate(reader.pages, start=1):
+    rotate_arg = f"--rotate=+{angle}"
+    if target_pages is not None:
+        rotate_arg = f"{rotate_arg}:{_format_qpdf_ranges(target_pages)}"
+    if _run_qpdf([rotate_arg, str(input_path), str(output_path)]):
+        return output_path
+
+    writer = PdfWriter(clone_from=reader)
+    for index, page in enumerate(writer.pages, start=1):
         if target_pages is None or index in target_pages:
             _rotate_page(page, angle)
-        writer.add_page(page)
-    _copy_metadata(writer, reader)
     with output_path.open("wb") as handle:
         writer.write(handle)
     return output_path
@@ -1119,15 +1414,18 @@ def remove_pages(
     pages: str,
 ) -> Path:
     """Remove pages listed in the range string."""
-    reader = PdfReader(str(input_path))
-    total_pages = len(reader.pages)
-    remove_set = set(_parse_page_list(pages, total_pages))
-    writer = PdfWriter()
-    for index, page in enumerate(reader.pages, start=1):
-        if index not in remove_set:
-            writer.add_page(page)
-    with output_path.open("wb") as handle:
-        writer.write(handle)
+    with _load_fitz(input_path) as document:
+        total_pages = document.page_count
+        remove_set = set(_parse_page_list(pages, total_pages))
+        keep = [index for index in range(total_pages) if index + 1 not in remove_set]
+        if not keep:
+            raise ValueError("Cannot remove every page")
+        # "." keeps the input as the primary file, so its metadata and outline survive.
+        page_spec = _format_qpdf_page_order([index + 1 for index in keep])
+        if _run_qpdf([str(input_path), "--pages", ".", page_spec, "--", str(output_path)]):
+            return output_path
+        document.select(keep)
+        document.save(str(output_path), garbage=1)
     return output_path
 
 
@@ -1147,16 +1445,16 @@ def reorder_pages(
     Returns:
         Path: The path to the written output PDF.
     """
-    reader = PdfReader(str(input_path))
-    total_pages = len(reader.pages)
-    order_list = _parse_page_list(order, total_pages) or list(
-        range(1, total_pages + 1)
-    )
-    writer = PdfWriter()
-    for page_index in order_list:
-        writer.add_page(reader.pages[page_index - 1])
-    with output_path.open("wb") as handle:
-        writer.write(handle)
+    with _load_fitz(input_path) as document:
+        total_pages = document.page_count
+        order_list = _parse_page_list(order, total_pages) or list(
+            range(1, total_pages + 1)
+        )
+        page_spec = _format_qpdf_page_order(order_list)
+        if _run_qpdf([str(input_path), "--pages", ".", page_spec, "--", str(output_path)]):
+            return output_path
+        document.select([page_index - 1 for page_index in order_list])
+        document.save(str(output_path), garbage=1)
     return output_path
 
 
@@ -1179,43 +1477,23 @@ def watermark_pdf(
     Returns:
         Path: The same as `output_path` after the watermarked PDF has been written.
     """
-    reader = _load_pdf(input_path)
-    writer = PdfWriter()
-    total_pages = len(reader.pages)
-    target_pages = _resolve_page_selection(pages, total_pages)
-    for index, page in enumerate(reader.pages, start=1):
-        if target_pages is None or index in target_pages:
-            box = page.cropbox if hasattr(page, "cropbox") else page.mediabox
-            width = float(box.upper_right[0] - box.lower_left[0])
-            height = float(box.upper_right[1] - box.lower_left[1])
-
-            def _draw(pdf: FPDF, width_mm: float, height_mm: float) -> None:
-                """
-                Render a large diagonal watermark from bottom-left to top-right.
-                
-                Calculates a font size from the smaller of the page width and height (clamped to 28-72), configures a unicode-capable font if required, sets a light gray color, and draws the text centered along a diagonal using rotation.
-                
-                Parameters:
-                    pdf (FPDF): The FPDF instance representing the overlay page to draw on.
-                    width_mm (float): Page width in millimeters.
-                    height_mm (float): Page height in millimeters.
-                """
-                font_size = min(max(int(min(width_mm, height_mm) * 0.2), 28), 120)
-                _set_overlay_font(pdf, text, font_size)
-                pdf.set_text_color(165, 165, 165)
-                angle = -math.degrees(math.atan2(height_mm, width_mm))
-                center_x = width_mm / 2
-                center_y = height_mm / 2
-                with pdf.rotation(angle, x=center_x, y=center_y):
-                    pdf.set_xy(0, center_y)
-                    pdf.cell(width_mm, 10, text, align="C")
-
-            overlay = _build_overlay_page(width, height, _draw)
-            _merge_overlay_page(page, overlay, box)
-        writer.add_page(page)
-    _copy_metadata(writer, reader)
-    with output_path.open("wb") as handle:
-        writer.write(handle)
+    with _load_fitz(input_path) as document:
+        target_pages = _resolve_page_selection(pages, document.page_count)
+        font_path = _overlay_font_path(text)
+        for index, page in enumerate(document, start=1):
+            if target_pages is not None and index not in target_pages:
+                continue
+            rect = _unrotated_rect(page)
+            # Large light-gray text along the top-left to bottom-right diagonal.
+            font_size = min(
+                max(int(min(_points_to_mm(rect.width), _points_to_mm(rect.height)) * 0.2), 28),
+                120,
+            )
+            angle = -math.degrees(math.atan2(rect.height, rect.width))
+            _insert_overlay_text(
+                page, text, (rect.tl + rect.br) / 2, font_size, 165 / 255, font_path, angle
+            )
+        _save_overlaid(document, output_path, font_path)
     return output_path
 
 
@@ -1237,44 +1515,23 @@ def page_numbers_pdf(
     Returns:
         Path: The path to the written PDF file (same as output_path).
     """
-    reader = _load_pdf(input_path)
-    writer = PdfWriter()
-    total_pages = len(reader.pages)
-    target_pages = _resolve_page_selection(pages, total_pages)
-    for index, page in enumerate(reader.pages, start=1):
-        if target_pages is None or index in target_pages:
-            box = page.cropbox if hasattr(page, "cropbox") else page.mediabox
-            width = float(box.upper_right[0] - box.lower_left[0])
-            height = float(box.upper_right[1] - box.lower_left[1])
-            number = start + index - 1
-
-            def _draw(pdf: FPDF, width_mm: float, height_mm: float) -> None:
-                """
-                Draws a centered numeric footer near the bottom edge of the overlay page.
-                
-                Positions and renders the page number (captured from the surrounding scope) as a footer using a font size chosen to fit the page: the size is proportional to the smaller page dimension and clamped to the range 8-16 points. The rendered text is centered with a 10 mm bottom margin and uses a muted gray color.
-                
-                Parameters:
-                    pdf (FPDF): The FPDF instance used to draw on the overlay page.
-                    width_mm (float): Page width in millimeters.
-                    height_mm (float): Page height in millimeters.
-                
-                Returns:
-                    None
-                """
-                font_size = min(max(int(min(width_mm, height_mm) * 0.04), 8), 16)
-                _set_overlay_font(pdf, str(number), font_size)
-                pdf.set_text_color(60, 60, 60)
-                margin = 10
-                pdf.set_xy(0, height_mm - margin)
-                pdf.cell(width_mm, 6, str(number), align="C")
-
-            overlay = _build_overlay_page(width, height, _draw)
-            _merge_overlay_page(page, overlay, box)
-        writer.add_page(page)
-    _copy_metadata(writer, reader)
-    with output_path.open("wb") as handle:
-        writer.write(handle)
+    with _load_fitz(input_path) as document:
+        target_pages = _resolve_page_selection(pages, document.page_count)
+        # Page numbers are ASCII digits, which Base-14 Helvetica always covers.
+        font_path = None
+        for index, page in enumerate(document, start=1):
+            if target_pages is not None and index not in target_pages:
+                continue
+            rect = _unrotated_rect(page)
+            font_size = min(
+                max(int(min(_points_to_mm(rect.width), _points_to_mm(rect.height)) * 0.04), 8),
+                16,
+            )
+            # Centered in a 6 mm footer band whose top sits 10 mm above the bottom edge.
+            center = fitz.Point(rect.x0 + rect.width / 2, rect.y1 - 7 * 72 / 25.4)
+            number = str(start + index - 1)
+            _insert_overlay_text(page, number, center, font_size, 60 / 255, font_path)
+        _save_overlaid(document, output_path, font_path)
     return output_path
 
 
@@ -1300,13 +1557,13 @@ def crop_pdf(
         ValueError: If the provided margins would remove an entire page or if margin parsing fails.
     """
     reader = _load_pdf(input_path)
-    writer = PdfWriter()
     total_pages = len(reader.pages)
     top, right, bottom, left = _parse_margins(margins)
     if any(value < 0 for value in (top, right, bottom, left)):
         raise ValueError("Margins must be zero or positive")
     target_pages = _resolve_page_selection(pages, total_pages)
-    for index, page in enumerate(reader.pages, start=1):
+    writer = PdfWriter(clone_from=reader)
+    for index, page in enumerate(writer.pages, start=1):
         if target_pages is None or index in target_pages:
             lower_left_x = float(page.mediabox.lower_left[0]) + left
             lower_left_y = float(page.mediabox.lower_left[1]) + bottom
@@ -1320,8 +1577,6 @@ def crop_pdf(
             page.cropbox.upper_right = (upper_right_x, upper_right_y)
             page.trimbox.lower_left = (lower_left_x, lower_left_y)
             page.trimbox.upper_right = (upper_right_x, upper_right_y)
-        writer.add_page(page)
-    _copy_metadata(writer, reader)
     with output_path.open("wb") as handle:
         writer.write(handle)
     return output_path
@@ -1344,7 +1599,7 @@ def unlock_pdf(input_path: Path, output_path: Path, password: str = "") -> Path:
     Raises:
         ValueError: If the PDF is encrypted and the provided password does not unlock it.
     """
-    qpdf = shutil.which("qpdf")
+    qpdf = _tool_path("qpdf")
     if qpdf:
         password_file: Path | None = None
         try:
@@ -1388,17 +1643,16 @@ def unlock_pdf(input_path: Path, output_path: Path, password: str = "") -> Path:
             if password_file is not None:
                 password_file.unlink(missing_ok=True)
 
-    reader = PdfReader(str(input_path))
-    if reader.is_encrypted:
-        result = reader.decrypt(password or "")
-        if result == 0:
+    # MuPDF decrypts RC4 and AES (including AES-256) natively, unlike pypdf without
+    # an optional crypto package.
+    try:
+        document = fitz.open(str(input_path), filetype="pdf")
+    except fitz.FileDataError as error:
+        raise ValueError("PDF appears to be corrupted or unreadable.") from error
+    with document:
+        if document.needs_pass and not document.authenticate(password or ""):
             raise ValueError("Password required to unlock this PDF")
-    writer = PdfWriter()
-    for page in reader.pages:
-        writer.add_page(page)
-    writer.add_metadata(reader.metadata or {})
-    with output_path.open("wb") as handle:
-        writer.write(handle)
+        document.save(str(output_path), garbage=1, encryption=fitz.PDF_ENCRYPT_NONE)
     return output_path
 
 
@@ -1406,7 +1660,7 @@ def protect_pdf(input_path: Path, output_path: Path, password: str) -> Path:
     """
     Encrypts an unencrypted PDF file with the specified password.
     
-    Sets the same value as both the user and owner password and enables 128-bit encryption; preserves the input PDF's metadata.
+    Sets the same value as both the user and owner password and encrypts with AES-256 in MuPDF; preserves the input PDF's metadata.
     
     Parameters:
         input_path (Path): Path to the source PDF file (must be unencrypted).
@@ -1419,19 +1673,79 @@ def protect_pdf(input_path: Path, output_path: Path, password: str) -> Path:
     Raises:
         ValueError: If the input PDF is already encrypted.
     """
-    reader = PdfReader(str(input_path))
-    if reader.is_encrypted:
+    if _has_encrypt_dictionary(input_path):
         raise ValueError("PDF is already encrypted")
-    writer = PdfWriter()
-    for page in reader.pages:
-        writer.add_page(page)
-    writer.add_metadata(reader.metadata or {})
-    writer.encrypt(user_password=password, owner_password=password, use_128bit=True)
-    with output_path.open("wb") as handle:
-        writer.write(handle)
+    with _load_fitz(input_path) as document:
+        document.save(
+            str(output_path),
+            garbage=1,
+            encryption=fitz.PDF_ENCRYPT_AES_256,
+            owner_pw=password,
+            user_pw=password,
+        )
     return output_path
 
 
+def _search_text_chunk(
+    input_path: str,
+    text: str,
+    page_indexes: List[int],
+) -> List[Tuple[int, List[Tuple[float, float, float, float]]]]:
+    """Search a slice of pages in a separately opened document (process-pool task)."""
+    with fitz.open(input_path) as document:
+        return [
+            (index, [tuple(rect) for rect in document.load_page(index).search_for(text)])
+            for index in page_indexes
+        ]
+
+
+def _search_processes() -> int:
+    """Return the number of processes available for page text search."""
+    value = os.getenv("ZENPDF_SEARCH_PROCESSES")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            pass
+    return os.cpu_count() or 1
+
+
+def _find_text_rects(
+    document: fitz.Document,
+    input_path: Path,
+    text: str,
+    page_indexes: List[int],
+) -> dict[int, List[fitz.Rect]]:
+    """
+    Locate `text` on the given 0-based pages, keyed by page index.
+
+    PyMuPDF holds the GIL while searching, so large documents are split across a
+    spawn-based process pool (the worker runs a heartbeat thread, which makes fork
+    unsafe); small ones are searched in place to avoid the pool start-up cost.
+    """
+    workers = min(_search_processes(), len(page_indexes) // SEARCH_PARALLEL_MIN_PAGES)
+    if workers <= 1:
+        return {index: document.load_page(index).search_for(text) for index in page_indexes}
+    chunk_size = math.ceil(len(page_indexes) / workers)
+    chunks = [
+        page_indexes[start : start + chunk_size]
+        for start in range(0, len(page_indexes), chunk_size)
+    ]
+    results: dict[int, List[fitz.Rect]] = {}
+    with ProcessPoolExecutor(
+        max_workers=len(chunks), mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        for chunk_result in executor.map(
+            _search_text_chunk,
+            [str(input_path)] * len(chunks),
+            [text] * len(chunks),
+            chunks,
+        ):
+            for index, rects in chunk_result:
+                results[index] = [fitz.Rect(*rect) for rect in rects]
+    return results
+
+
 def redact_pdf(
     input_path: Path,
     output_path: Path,
@@ -1456,14 +1770,17 @@ def redact_pdf(
         _assert_fitz_unencrypted(document)
         total_pages = document.page_count
         target_pages = _resolve_page_selection(pages, total_pages)
-        for index in range(total_pages):
-            page_number = index + 1
-            if target_pages is not None and page_number not in target_pages:
-                continue
-            page = document.load_page(index)
-            rectangles = page.search_for(text)
+        page_indexes = [
+            index
+            for index in range(total_pages)
+            if target_pages is None or index + 1 in target_pages
+        ]
+        matches = _find_text_rects(document, input_path, text, page_indexes)
+        for index in page_indexes:
+            rectangles = matches.get(index)
             if not rectangles:
                 continue
+            page = document.load_page(index)
             for rect in rectangles:
                 page.add_redact_annot(rect, fill=(0, 0, 0))
             page.apply_redactions()
@@ -1495,20 +1812,77 @@ def highlight_pdf(
         _assert_fitz_unencrypted(document)
         total_pages = document.page_count
         target_pages = _resolve_page_selection(pages, total_pages)
-        for index in range(total_pages):
-            page_number = index + 1
-            if target_pages is not None and page_number not in target_pages:
-                continue
-            page = document.load_page(index)
-            rectangles = page.search_for(text)
+        page_indexes = [
+            index
+            for index in range(total_pages)
+            if target_pages is None or index + 1 in target_pages
+        ]
+        matches = _find_text_rects(document, input_path, text, page_indexes)
+        for index in page_indexes:
+            rectangles = matches.get(index)
             if not rectangles:
                 continue
+            page = document.load_page(index)
             for rect in rectangles:
                 page.add_highlight_annot(rect)
         document.save(str(output_path), deflate=True)
     return output_path
 
 
+def _font_program_digest(document: fitz.Document, xref: int) -> bytes:
+    """
+    Digest the embedded font program, which decodes glyphs that have no /ToUnicode entry.
+
+    Type0 fonts keep the program on their descendant CIDFont. Fonts without an embedded
+    program yield an empty digest; their name and encoding already identify them.
+    """
+    key_type, value = document.xref_get_key(xref, "DescendantFonts")
+    if key_type == "xref":
+        key_type, value = "array", document.xref_object(int(value.split()[0]))
+    if key_type == "array":
+        refs = value.strip("[] \n").split()
+        if refs:
+            xref = int(refs[0])
+    for name in ("FontFile", "FontFile2", "FontFile3"):
+        key_type, value = document.xref_get_key(xref, f"FontDescriptor/{name}")
+        if key_type == "xref":
+            raw = document.xref_stream_raw(int(value.split()[0]))
+            return hashlib.blake2b(raw).digest()
+    return b""
+
+
+def _font_text_key(document: fitz.Document, font: tuple) -> tuple:
+    """Describe a page font by the maps and program that turn its glyph codes into text."""
+    xref = font[0]
+    key_type, value = document.xref_get_key(xref, "ToUnicode")
+    to_unicode = document.xref_stream(int(value.split()[0])) if key_type == "xref" else b""
+    key_type, value = document.xref_get_key(xref, "Encoding")
+    encoding = document.xref_object(int(value.split()[0])) if key_type == "xref" else value
+    program = _font_program_digest(document, xref)
+    # Font xrefs differ between files; the remaining fields identify the font itself.
+    return (*font[1:], to_unicode, encoding, program)
+
+
+def _page_text_signature(document: fitz.Document, page: fitz.Page) -> tuple | None:
+    """
+    Return what a page's extracted text depends on, or None if that is not cheap to tell.
+
+    Equal content streams drawn with the same fonts inside the same visible area yield
+    equal text, so compare_pdfs can skip extraction for them. Pages that draw form
+    XObjects hide text outside the page's own stream and always get None.
+    """
+    if document.get_page_xobjects(page.number):
+        return None
+    fonts = [_font_text_key(document, font) for font in document.get_page_fonts(page.number)]
+    geometry = (
+        tuple(page.rect),
+        tuple(page.cropbox),
+        tuple(page.mediabox),
+        page.rotation,
+    )
+    return page.read_contents(), fonts, geometry
+
+
 def compare_pdfs(first_path: Path, second_path: Path, output_path: Path) -> Path:
     """
     Produce a plain-text comparison report summarizing page counts and per-page text differences between two PDFs.
@@ -1523,31 +1897,35 @@ def compare_pdfs(first_path: Path, second_path: Path, output_path: Path) -> Path
     Returns:
         Path: The path to the written report (output_path).
     """
-    reader_a = _load_pdf(first_path)
-    reader_b = _load_pdf(second_path)
-    pages_a = len(reader_a.pages)
-    pages_b = len(reader_b.pages)
-    lines = [
-        "ZenPDF comparison report",
-        f"File A: {first_path.name}",
-        f"File B: {second_path.name}",
-        f"Pages: {pages_a} vs {pages_b}",
-        "",
-    ]
-    differences: List[str] = []
-    if pages_a != pages_b:
-        differences.append("Page counts differ.")
-    for index in range(max(pages_a, pages_b)):
-        if index >= pages_a:
-            differences.append(f"Page {index + 1}: missing from file A")
-            continue
-        if index >= pages_b:
-            differences.append(f"Page {index + 1}: missing from file B")
-            continue
-        text_a = (reader_a.pages[index].extract_text() or "").strip()
-        text_b = (reader_b.pages[index].extract_text() or "").strip()
-        if text_a != text_b:
-            differences.append(f"Page {index + 1}: text differs")
+    with _load_fitz(first_path) as document_a, _load_fitz(second_path) as document_b:
+        pages_a = document_a.page_count
+        pages_b = document_b.page_count
+        lines = [
+            "ZenPDF comparison report",
+            f"File A: {first_path.name}",
+            f"File B: {second_path.name}",
+            f"Pages: {pages_a} vs {pages_b}",
+            "",
+        ]
+        differences: List[str] = []
+        if pages_a != pages_b:
+            differences.append("Page counts differ.")
+        # Plain equality is a single memcmp; only a boolean per page is reported.
+        for index in range(min(pages_a, pages_b)):
+            page_a = document_a.load_page(index)
+            page_b = document_b.load_page(index)
+            signature_a = _page_text_signature(document_a, page_a)
+            if signature_a is not None and signature_a == _page_text_signature(document_b, page_b):
+                continue
+            text_a = (page_a.get_text("text") or "").strip()
+            text_b = (page_b.get_text("text") or "").strip()
+            if text_a != text_b:
+                differences.append(f"Page {index + 1}: text differs")
+        missing_from = "A" if pages_a < pages_b else "B"
+        differences.extend(
+            f"Page {index + 1}: missing from file {missing_from}"
+            for index in range(min(pages_a, pages_b), max(pages_a, pages_b))
+        )
     if not differences:
         lines.append("No text differences detected.")
     else:
@@ -1570,45 +1948,108 @@ def image_to_pdf(inputs: Sequence[Path], output_path: Path) -> Path:
     Raises:
         ValueError: If image rendering to PDF fails.
     """
-    pdf_bytes = img2pdf.convert([str(path) for path in inputs])
-    if pdf_bytes is None:
+    # Stream straight into the file instead of holding the whole PDF as one bytes object.
+    with output_path.open("wb", buffering=WRITE_BUFFER_BYTES) as handle:
+        img2pdf.convert([str(path) for path in inputs], outputstream=handle)
+    if output_path.stat().st_size == 0:
         raise ValueError("Failed to render images to PDF")
-    output_path.write_bytes(pdf_bytes)
     return output_path
 
 
+def _render_jpg(
+    document: fitz.Document,
+    index: int,
+    matrix: fitz.Matrix,
+    output_path: Path,
+) -> None:
+    """Rasterize one page to an RGB pixmap and encode it as JPEG."""
+    page = document.load_page(index)
+    render = getattr(page, "get_pixmap", None)
+    if not callable(render):
+        raise ValueError("PDF renderer unavailable")
+    pix = render(matrix=matrix, colorspace=fitz.csRGB, alpha=False)
+    saver = getattr(pix, "save", None)
+    if not callable(saver):
+        raise ValueError("Rendered page cannot be saved")
+    saver(str(output_path))
+
+
+def _render_jpg_chunk(input_path: str, dpi: int, pages: List[Tuple[int, str]]) -> None:
+    """Render a slice of pages from a separately opened document (process-pool task)."""
+    scale = dpi / 72
+    matrix = fitz.Matrix(scale, scale)
+    with fitz.open(input_path) as document:
+        for index, output_path in pages:
+            _render_jpg(document, index, matrix, Path(output_path))
+
+
+def _render_processes() -> int:
+    """Return the number of processes available for page rendering."""
+    value = os.getenv("ZENPDF_RENDER_PROCESSES")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            pass
+    return os.cpu_count() or 1
+
+
 def pdf_to_jpg(input_path: Path, output_dir: Path, dpi: int = 150) -> List[Path]:
-    """Render each PDF page to a JPG image."""
+    """
+    Render each PDF page to a JPG image.
+
+    Pages are rasterized by MuPDF straight into an RGB pixmap at the target DPI and
+    encoded to JPEG without a Pillow round-trip. PyMuPDF holds the GIL while rendering,
+    so long documents are split across a spawn-based process pool, as in text search.
+    """
     with fitz.open(str(input_path)) as document:
         _assert_fitz_unencrypted(document)
-        scale = dpi / 72
-        matrix = fitz.Matrix(scale, scale)
-        outputs: List[Path] = []
         stem = input_path.stem
         if "_" in stem:
             prefix, remainder = stem.split("_", 1)
             if prefix.isdigit() and len(prefix) == 2:
                 stem = remainder
-        for index in range(document.page_count):
-            page = document.load_page(index)
-            render = getattr(page, "get_pixmap", None)
-            if not callable(render):
-                raise ValueError("PDF renderer unavailable")
-            pix = render(matrix=matrix)
-            output_path = output_dir / f"{stem}_{index + 1}.jpg"
-            saver = getattr(pix, "save", None)
-            if not callable(saver):
-                raise ValueError("Rendered page cannot be saved")
-            saver(str(output_path))
-            outputs.append(output_path)
-        return outputs
+        outputs = [
+            output_dir / f"{stem}_{index + 1}.jpg" for index in range(document.page_count)
+        ]
+        workers = min(_render_processes(), len(outputs) // RENDER_PARALLEL_MIN_PAGES)
+        if workers <= 1:
+            scale = dpi / 72
+            matrix = fitz.Matrix(scale, scale)
+            for index, output_path in enumerate(outputs):
+                _render_jpg(document, index, matrix, output_path)
+            return outputs
+    # Contiguous chunks keep each child's page-tree and font caches warm.
+    chunk_size = math.ceil(len(outputs) / workers)
+    pages = [(index, str(output_path)) for index, output_path in enumerate(outputs)]
+    chunks = [pages[start : start + chunk_size] for start in range(0, len(pages), chunk_size)]
+    with ProcessPoolExecutor(
+        max_workers=len(chunks), mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        for _ in executor.map(
+            _render_jpg_chunk,
+            [str(input_path)] * len(chunks),
+            [dpi] * len(chunks),
+            chunks,
+        ):
+            pass
+    return outputs
+
+
+# Formats that are already compressed; deflating them again only burns CPU.
+STORED_ZIP_SUFFIXES = {".jpg", ".jpeg", ".png", ".pdf", ".docx", ".xlsx", ".pptx", ".zip", ".gz"}
 
 
 def zip_outputs(outputs: Iterable[Path], zip_path: Path) -> Path:
     """Zip multiple output files into a single archive."""
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+    with zipfile.ZipFile(
+        zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+    ) as archive:
         for item in outputs:
-            archive.write(item, arcname=item.name)
+            if item.suffix.lower() in STORED_ZIP_SUFFIXES:
+                archive.write(item, arcname=item.name, compress_type=zipfile.ZIP_STORED)
+            else:
+                archive.write(item, arcname=item.name)
     return zip_path
 
 
@@ -1621,6 +2062,11 @@ UNICODE_FONT_PATHS = (
 )
 
 
+UNICODE_FONT_UNAVAILABLE = (
+    "Unicode font unavailable. Set ZENPDF_TTF_PATH to a Unicode TTF (e.g. DejaVuSans.ttf or NotoSans-Regular.ttf)."
+)
+
+
 def _resolve_unicode_font_path() -> Path | None:
     """
     Locate a Unicode-compatible TrueType font file if one is available.
@@ -1641,32 +2087,20 @@ def _resolve_unicode_font_path() -> Path | None:
     return None
 
 
-def _set_overlay_font(pdf: FPDF, text: str, size: int) -> None:
+def _overlay_font_path(text: str) -> Path | None:
     """
-    Selects and configures an appropriate font on the given FPDF instance for rendering overlay text.
-    
-    Attempts to load a Unicode-capable DejaVu Sans from the environment or known paths; if unavailable, verifies whether the provided text can be encoded in Latin-1 and falls back to Helvetica. If the text requires Unicode and no Unicode font is available, raises RuntimeError.
-    
-    Parameters:
-        pdf (FPDF): The FPDF instance to configure.
-        text (str): Sample text to test whether a Unicode font is required.
-        size (int): Font size to set on the PDF.
-    
-    Raises:
-        RuntimeError: If the text contains characters that require a Unicode font but no Unicode font path is available.
+    Return the Unicode font MuPDF needs to draw `text`, or None when Base-14 Helvetica can.
+
+    Helvetica is never embedded, so Latin-1 overlays add no font data to the output.
     """
-    font_path = _resolve_unicode_font_path()
-    if font_path:
-        pdf.add_font("DejaVuSans", fname=str(font_path))
-        pdf.set_font("DejaVuSans", size=size)
-        return
     try:
         text.encode("latin-1")
     except UnicodeEncodeError as error:
-        raise RuntimeError(
-            "Unicode font unavailable. Set ZENPDF_TTF_PATH to a Unicode TTF (e.g. DejaVuSans.ttf or NotoSans-Regular.ttf)."
-        ) from error
-    pdf.set_font("Helvetica", size=size)
+        font_path = _resolve_unicode_font_path()
+        if font_path is None:
+            raise RuntimeError(UNICODE_FONT_UNAVAILABLE) from error
+        return font_path
+    return None
 
 
 class _HTMLTextExtractor(HTMLParser):
@@ -1688,8 +2122,41 @@ class _HTMLTextExtractor(HTMLParser):
         return "\n".join(self._parts)
 
 
-def html_to_pdf(html: str, output_path: Path) -> Path:
-    """Render basic HTML text into a PDF."""
+def _set_html_font(pdf: FPDF, text: str, size: int) -> None:
+    """
+    Selects and configures an appropriate font on the given FPDF instance for rendering HTML-to-PDF text.
+    
+    Attempts to load a Unicode-capable DejaVu Sans from the environment or known paths; if unavailable, verifies whether the provided text can be encoded in Latin-1 and falls back to Helvetica. If the text requires Unicode and no Unicode font is available, raises RuntimeError.
+    
+    Parameters:
+        pdf (FPDF): The FPDF instance to configure.
+        text (str): Sample text to test whether a Unicode font is required.
+        size (int): Font size to set on the PDF.
+    
+    Raises:
+        RuntimeError: If the text contains characters that require a Unicode font but no Unicode font path is available.
+    """
+    font_path = _resolve_unicode_font_path()
+    if font_path:
+        pdf.add_font("DejaVuSans", fname=str(font_path))
+        pdf.set_font("DejaVuSans", size=size)
+        return
+    if not text.isascii():
+        try:
+            text.encode("latin-1")
+        except UnicodeEncodeError as error:
+            raise RuntimeError(UNICODE_FONT_UNAVAILABLE) from error
+    pdf.set_font("Helvetica", size=size)
+
+
+def html_to_pdf(
+    html: str | bytes | bytearray,
+    output_path: Path,
+    encoding: str = "utf-8",
+) -> Path:
+    """Render basic HTML text into a PDF, decoding raw bytes with `encoding`."""
+    if not isinstance(html, str):
+        html = str(html, encoding, errors="replace")
     parser = _HTMLTextExtractor()
     parser.feed(html)
     text = parser.text() or "(no content)"
@@ -1698,18 +2165,7 @@ def html_to_pdf(html: str, output_path: Path) -> Path:
     pdf.set_margins(15, 15, 15)
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.add_page()
-    font_path = _resolve_unicode_font_path()
-    if font_path:
-        pdf.add_font("DejaVuSans", fname=str(font_path))
-        pdf.set_font("DejaVuSans", size=12)
-    else:
-        try:
-            text.encode("latin-1")
-        except UnicodeEncodeError as error:
-            raise RuntimeError(
-                "Unicode font unavailable. Set ZENPDF_TTF_PATH to a Unicode TTF (e.g. DejaVuSans.ttf or NotoSans-Regular.ttf)."
-            ) from error
-        pdf.set_font("Helvetica", size=12)
+    _set_html_font(pdf, text, 12)
     max_width = pdf.w - pdf.l_margin - pdf.r_margin
     for line in text.splitlines():
         if line.strip():
@@ -1720,6 +2176,23 @@ def html_to_pdf(html: str, output_path: Path) -> Path:
     return output_path
 
 
+@lru_cache(maxsize=1)
+def _web_session() -> requests.Session:
+    """
+    Return the pooled session used for pinned-IP web fetches in this process.
+
+    Keep-alive connections are reused across jobs. urllib3 keys its pools by the
+    `assert_hostname` the Host-header adapter sets, so a TLS connection verified for
+    one hostname is never handed to a request for another. The session serves every
+    job, so it never stores cookies: one user's Set-Cookie must not be sent on another
+    user's fetch.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    session.mount("https://", HostHeaderSSLAdapter())
+    return session
+
+
 def web_to_pdf(url: str, output_path: Path) -> Path:
     """Fetch a URL and convert its HTML to PDF."""
     parsed = urlparse(url)
@@ -1764,9 +2237,9 @@ def web_to_pdf(url: str, output_path: Path) -> Path:
             for chunk in response.iter_content(chunk_size=64 * 1024):
                 if not chunk:
                     continue
-                body.extend(chunk)
-                if len(body) > MAX_WEB_BYTES:
+                if len(body) + len(chunk) > MAX_WEB_BYTES:
                     raise ValueError("Web response too large")
+                body.extend(chunk)
             encoding = response.encoding or "utf-8"
         return body, encoding
 
@@ -1780,44 +2253,55 @@ def web_to_pdf(url: str, output_path: Path) -> Path:
         )
     )
 
-    with requests.Session() as session:
-        if parsed.scheme == "https":
-            session.mount("https://", HostHeaderSSLAdapter())
-
-        try:
+    try:
+        body, encoding = _fetch_html(
+            _web_session(),
+            target_url,
+            host_header,
+            not allow_insecure,
+        )
+    except requests.exceptions.SSLError:
+        allow_fallback = parsed.scheme == "https" and (
+            os.getenv("ZENPDF_WEB_ALLOW_HOSTNAME_FALLBACK") == "1"
+            and (
+                os.getenv("ZENPDF_DEV_MODE") == "1"
+                or os.getenv("NODE_ENV") == "development"
+            )
+        )
+        if not allow_fallback:
+            raise
+        # Re-validate hostname before falling back to hostname-based HTTPS.
+        _resolve_public_ip(parsed.hostname)
+        with requests.Session() as fallback_session:
             body, encoding = _fetch_html(
-                session,
-                target_url,
-                host_header,
+                fallback_session,
+                parsed.geturl(),
+                None,
                 not allow_insecure,
             )
-        except requests.exceptions.SSLError:
-            allow_fallback = parsed.scheme == "https" and (
-                os.getenv("ZENPDF_WEB_ALLOW_HOSTNAME_FALLBACK") == "1"
-                and (
-                    os.getenv("ZENPDF_DEV_MODE") == "1"
-                    or os.getenv("NODE_ENV") == "development"
-                )
-            )
-            if not allow_fallback:
-                raise
-            # Re-validate hostname before falling back to hostname-based HTTPS.
-            _resolve_public_ip(parsed.hostname)
-            with requests.Session() as fallback_session:
-                body, encoding = _fetch_html(
-                    fallback_session,
-                    parsed.geturl(),
-                    None,
-                    not allow_insecure,
-                )
 
-    html = body.decode(encoding, errors="replace")
-    return html_to_pdf(html, output_path)
+    return html_to_pdf(body, output_path, encoding)
+
+
+@lru_cache(maxsize=1)
+def _soffice_profile_dir() -> Path:
+    """
+    Return a LibreOffice user profile directory that persists for this worker process.
+
+    A fresh profile costs seconds of first-start initialisation on every call, and the
+    service user has no writable home. Jobs run one at a time per process, so a
+    per-PID profile is never used by two conversions at once.
+    """
+    configured = os.getenv("ZENPDF_SOFFICE_PROFILE_DIR")
+    base = Path(configured) if configured else Path(tempfile.gettempdir())
+    profile_dir = base / f"zenpdf-soffice-{os.getpid()}"
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    return profile_dir
 
 
 def office_to_pdf(input_path: Path, output_dir: Path) -> Path:
     """Convert an Office document to PDF using LibreOffice."""
-    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    soffice = _tool_path("soffice") or _tool_path("libreoffice")
     if not soffice:
         raise RuntimeError("LibreOffice is required for Office to PDF conversion")
 
@@ -1827,6 +2311,7 @@ def office_to_pdf(input_path: Path, output_dir: Path) -> Path:
         result = subprocess.run(
             [
                 soffice,
+                f"-env:UserInstallation={_soffice_profile_dir().as_uri()}",
                 "--headless",
                 "--convert-to",
                 "pdf",
@@ -2102,17 +2587,14 @@ def edit_pdf(
     return output_path
 
 
-def organize_pdf(
-    input_path: Path,
-    output_path: Path,
-    order: str | None = None,
-    delete: str | None = None,
-    rotate: str | None = None,
-) -> Path:
-    """Apply remove, reorder, and rotate in one deterministic operation."""
-    reader = _load_pdf(input_path)
-    total_pages = len(reader.pages)
-    delete_pages_set = _resolve_page_selection(delete, total_pages) or set()
+def _organize_plan(
+    total_pages: int,
+    order: str | None,
+    delete: str | None,
+    rotate: str | None,
+) -> Tuple[List[int], dict[int, int]]:
+    """Return organize_pdf's output page order and per-page rotations, validating both."""
+    delete_pages_set = _resolve_page_selection(delete, total_pages) or frozenset()
     if order and order.strip():
         ordered_pages: list[int] = []
         seen: set[int] = set()
@@ -2147,17 +2629,31 @@ def organize_pdf(
             if angle_value not in (90, 180, 270):
                 raise ValueError("Rotate angle must be 90, 180, or 270")
             rotations[page_value] = angle_value
+    return ordered_pages, rotations
 
-    writer = PdfWriter()
-    for page_number in ordered_pages:
-        page = reader.pages[page_number - 1]
-        angle = rotations.get(page_number)
-        if angle:
-            _rotate_page(page, angle)
-        writer.add_page(page)
-    _copy_metadata(writer, reader)
-    with output_path.open("wb") as handle:
-        writer.write(handle)
+
+def organize_pdf(
+    input_path: Path,
+    output_path: Path,
+    order: str | None = None,
+    delete: str | None = None,
+    rotate: str | None = None,
+) -> Path:
+    """
+    Apply remove, reorder, and rotate in one deterministic operation.
+
+    MuPDF rewrites only the page tree and rotation entries, so page content streams
+    are copied as-is; unreferenced objects from deleted pages are dropped on save.
+    """
+    with _load_fitz(input_path) as document:
+        total_pages = document.page_count
+        ordered_pages, rotations = _organize_plan(total_pages, order, delete, rotate)
+        document.select([page_number - 1 for page_number in ordered_pages])
+        for page, page_number in zip(document, ordered_pages):
+            angle = rotations.get(page_number)
+            if angle:
+                page.set_rotation((page.rotation + angle) % 360)
+        document.save(str(output_path), garbage=1)
     return output_path
 
 
@@ -2165,7 +2661,7 @@ def ocr_pdf(input_path: Path, output_path: Path, lang: str | None = None) -> Pat
     """Convert a PDF into a searchable OCR PDF."""
     language = (lang or DEFAULT_OCR_LANG).strip() or DEFAULT_OCR_LANG
     if os.getenv("ZENPDF_OCR_USE_OCRMYPDF", "1") == "1":
-        ocrmypdf = shutil.which("ocrmypdf")
+        ocrmypdf = _tool_path("ocrmypdf")
         if ocrmypdf:
             try:
                 result = subprocess.run(
@@ -2191,12 +2687,12 @@ def ocr_pdf(input_path: Path, output_path: Path, lang: str | None = None) -> Pat
     if pytesseract is None:
         raise RuntimeError("OCR PDF conversion requires pytesseract")
     if (
-        not shutil.which("tesseract")
+        not _tool_path("tesseract")
         and getattr(pytesseract, "__name__", "") == "pytesseract"
     ):
         raise RuntimeError("OCR PDF conversion requires tesseract")
     page_outputs: list[Path] = []
-    run_id = uuid.uuid4().hex[:8]
+    run_id = _run_id()
     with fitz.open(str(input_path)) as document:
         _assert_fitz_unencrypted(document)
         for index in range(document.page_count):
@@ -2242,6 +2738,30 @@ def _parse_version_tuple(raw: str) -> Tuple[int, int, int]:
     return (numbers[0], numbers[1], numbers[2])
 
 
+@lru_cache(maxsize=4)
+def _ghostscript_version(ghostscript: str) -> Tuple[int, int, int]:
+    """
+    Return the version of a Ghostscript executable.
+
+    The result is cached per executable path so each worker process runs
+    `gs --version` once instead of on every conversion. Failures are not cached.
+    """
+    version_result = subprocess.run(
+        [ghostscript, "--version"],
+        capture_output=True,
+        text=True,
+        check=False,
+        timeout=PDF_A_VERSION_TIMEOUT_SEC,
+    )
+    if version_result.returncode != 0:
+        raise RuntimeError("Ghostscript version check failed")
+    version_output = (version_result.stdout or version_result.stderr or "").strip()
+    try:
+        return _parse_version_tuple(version_output)
+    except ValueError as error:
+        raise RuntimeError("Ghostscript >= 10.03.1 is required for PDF/A conversion") from error
+
+
 def pdf_to_pdfa(input_path: Path, output_path: Path) -> Path:
     """
     Convert a PDF into PDF/A-2b using Ghostscript.
@@ -2257,28 +2777,14 @@ def pdf_to_pdfa(input_path: Path, output_path: Path) -> Path:
         RuntimeError: If Ghostscript is missing, times out, or fails the conversion.
         ValueError: If the input PDF is encrypted.
     """
-    reader = PdfReader(str(input_path))
-    if reader.is_encrypted:
+    if _has_encrypt_dictionary(input_path):
         raise ValueError("Encrypted PDFs are not supported for PDF/A conversion")
 
-    ghostscript = shutil.which("gs")
+    ghostscript = _tool_path("gs")
     if not ghostscript:
         raise RuntimeError("Ghostscript is required for PDF/A conversion")
 
-    version_result = subprocess.run(
-        [ghostscript, "--version"],
-        capture_output=True,
-        text=True,
-        check=False,
-        timeout=PDF_A_VERSION_TIMEOUT_SEC,
-    )
-    if version_result.returncode != 0:
-        raise RuntimeError("Ghostscript version check failed")
-    version_output = (version_result.stdout or version_result.stderr or "").strip()
-    try:
-        version = _parse_version_tuple(version_output)
-    except ValueError as error:
-        raise RuntimeError("Ghostscript >= 10.03.1 is required for PDF/A conversion") from error
+    version = _ghostscript_version(ghostscript)
     if version < PDF_A_MIN_VERSION:
         raise RuntimeError("Ghostscript >= 10.03.1 is required for PDF/A conversion")
 
@@ -2340,16 +2846,16 @@ def pdf_to_docx(input_path: Path, output_path: Path) -> Path:
 
 def pdf_to_text(input_path: Path, output_path: Path) -> Path:
     """Extract PDF text into a plain UTF-8 text file."""
-    reader = _load_pdf(input_path)
     lines: List[str] = []
-    for index, page in enumerate(reader.pages, start=1):
-        text = page.extract_text() or ""
-        if index > 1:
-            lines.append("")
-        if text.strip():
-            lines.extend(line.rstrip() for line in text.splitlines())
-        else:
-            lines.append("")
+    with _load_fitz(input_path) as document:
+        for index, page in enumerate(document, start=1):
+            text = page.get_text("text") or ""
+            if index > 1:
+                lines.append("")
+            if text.strip():
+                lines.extend(line.rstrip() for line in text.splitlines())
+            else:
+                lines.append("")
     output_path.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
     return output_path
 
@@ -2357,29 +2863,53 @@ def _render_page_image(page: fitz.Page, dpi: int) -> Image.Image:
     """Render a PDF page to a PIL image for OCR."""
     scale = dpi / 72
     matrix = fitz.Matrix(scale, scale)
-    pix = page.get_pixmap(matrix=matrix, alpha=False)
-    image = Image.open(BytesIO(pix.tobytes("png")))
-    return image.convert("RGB")
+    pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csRGB, alpha=False)
+    # Wrap the raw RGB samples directly; a PNG encode/decode round trip is pure overhead.
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
 
 
 def _ocr_image(image: Image.Image, lang: str) -> str:
     """Run OCR on a PIL image using Tesseract."""
     if pytesseract is None:
         raise RuntimeError("pytesseract is required for OCR conversions")
-    if not shutil.which("tesseract"):
+    if not _tool_path("tesseract"):
         raise RuntimeError("Tesseract is required for OCR conversions")
     return pytesseract.image_to_string(image, lang=lang)
 
 
+def _ocr_concurrency() -> int:
+    """Return the number of pages to OCR concurrently."""
+    value = os.getenv("ZENPDF_OCR_CONCURRENCY")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            pass
+    return os.cpu_count() or 1
+
+
 def _ocr_pdf_pages(input_path: Path, lang: str, dpi: int) -> List[str]:
-    """Extract OCR text for each page in a PDF."""
+    """
+    Extract OCR text for each page in a PDF.
+
+    Pages are rendered on the calling thread (PyMuPDF documents are not thread-safe)
+    and handed to a thread pool for Tesseract, which runs out of process. At most
+    `ZENPDF_OCR_CONCURRENCY` rendered pages are held in memory at once, and results
+    are returned in page order.
+    """
+    workers = _ocr_concurrency()
     document = fitz.open(str(input_path))
     page_texts: List[str] = []
     try:
-        for index in range(document.page_count):
-            page = document.load_page(index)
-            image = _render_page_image(page, dpi)
-            page_texts.append(_ocr_image(image, lang).strip())
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: List[Future] = []
+            for index in range(document.page_count):
+                page = document.load_page(index)
+                image = _render_page_image(page, dpi)
+                pending.append(executor.submit(_ocr_image, image, lang))
+                if len(pending) >= workers:
+                    page_texts.append(pending.pop(0).result().strip())
+            page_texts.extend(future.result().strip() for future in pending)
     finally:
         document.close()
     return page_texts
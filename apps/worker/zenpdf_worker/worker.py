@@ -3,10 +3,11 @@
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
@@ -139,6 +140,7 @@ def _parse_int(value: Any, default: int) -> int:
 
 
 MAX_DPI = 300
+MAX_PARALLEL_DOWNLOADS = 4
 
 
 @dataclass
@@ -157,6 +159,8 @@ class ZenPdfWorker:
         self.worker_id = worker_id
         self.worker_token = worker_token
         self._client_lock = threading.Lock()
+        # Reuse keep-alive connections for storage transfers (urllib3 pools are thread-safe).
+        self._storage_session = requests.Session()
 
     def run(self) -> None:
         """Run the worker polling loop."""
@@ -281,8 +285,14 @@ class ZenPdfWorker:
             self._report(job_id, progress["value"])
 
     def _download_inputs(self, inputs: List[Dict[str, Any]], temp: Path) -> List[Path]:
-        """Download job inputs to a temporary directory."""
-        paths: List[Path] = []
+        """
+        Download job inputs to a temporary directory.
+
+        Download URLs are resolved first (Convex calls stay serialized behind the client
+        lock), then multi-file jobs fetch their inputs concurrently so the transfers
+        overlap instead of paying one round trip after another.
+        """
+        downloads: List[Tuple[str, Path]] = []
         for index, item in enumerate(inputs, start=1):
             url = self._query(
                 "files:getDownloadUrl",
@@ -294,15 +304,23 @@ class ZenPdfWorker:
             if not url:
                 raise RuntimeError("Missing download URL")
             filename = f"{index:02d}_{Path(item['filename']).name}"
-            target = temp / filename
-            with requests.get(url, stream=True, timeout=120) as response:
-                response.raise_for_status()
-                with target.open("wb") as handle:
-                    for chunk in response.iter_content(chunk_size=1024 * 1024):
-                        if chunk:
-                            handle.write(chunk)
-            paths.append(target)
-        return paths
+            downloads.append((url, temp / filename))
+
+        if len(downloads) <= 1:
+            return [self._download_file(url, target) for url, target in downloads]
+        workers = min(MAX_PARALLEL_DOWNLOADS, len(downloads))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda item: self._download_file(*item), downloads))
+
+    def _download_file(self, url: str, target: Path) -> Path:
+        """Stream a storage URL to `target`."""
+        with self._storage_session.get(url, stream=True, timeout=120) as response:
+            response.raise_for_status()
+            with target.open("wb") as handle:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    if chunk:
+                        handle.write(chunk)
+        return target
 
     def _run_tool(
         self, job: Dict[str, Any], inputs: List[Path], temp: Path
@@ -479,7 +497,7 @@ class ZenPdfWorker:
                 "files:generateUploadUrl", {"workerToken": self.worker_token}
             )
             with output.open("rb") as handle:
-                response = requests.post(
+                response = self._storage_session.post(
                     upload_url,
                     data=handle,
                     headers={"Content-Type": "application/octet-stream"},